@@ -0,0 +1,322 @@
+import hashlib
+import json
+import logging
+import time
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import models, router, transaction
+from django.db.models import QuerySet, signals
+
+from easy.controller.meta_conf import ModelMeta
+from easy.executor import run_in_db_executor
+from easy.renderer.json import EncodedJSON
+
+logger = logging.getLogger(__name__)
+
+OBJECT_CACHE_KEY_PREFIX = "easy:obj"
+OBJECT_VERSION_KEY_PREFIX = "easy:objv"
+LIST_CACHE_KEY_PREFIX = "easy:list"
+GENERATION_KEY_PREFIX = "easy:gen"
+CACHE_DISPATCH_UID = "easy_cache"
+
+# Models having the object cache on
+_object_cached_models: Set[Type[models.Model]] = set()
+# Models having the list cache on
+_list_cached_models: Set[Type[models.Model]] = set()
+
+
+def get_cache_scope(name: str) -> str:
+    """
+    Short stable hash of the dotted name of a class (e.g. controller), scoping
+    the cache entries it makes: the objects it serves may be filtered by its
+    service
+    """
+    return hashlib.md5(name.encode()).hexdigest()[:12]
+
+
+def get_fieldset_key(fieldset: Optional[FrozenSet[str]]) -> str:
+    return ",".join(sorted(fieldset)) if fieldset is not None else ""
+
+
+def get_object_cache_key(
+    model_meta: ModelMeta, scope: str, pk: Any, fieldset: Optional[FrozenSet[str]]
+) -> str:
+    """
+    Cache key of an object, serialized under the options of model_meta, for
+    the scope (controller) and sparse fieldset
+    """
+    label = model_meta.model._meta.label_lower
+    digest = hashlib.md5(get_fieldset_key(fieldset).encode()).hexdigest()[:12]
+    return (
+        f"{OBJECT_CACHE_KEY_PREFIX}:{label}:{model_meta.fingerprint_hash}:"
+        f"{scope}:{pk}:{digest}"
+    )
+
+
+def get_object_version_key(model: Type[models.Model], pk: Any) -> str:
+    return f"{OBJECT_VERSION_KEY_PREFIX}:{model._meta.label_lower}:{pk}"
+
+
+async def aget_counter(key: str) -> int:
+    """
+    Value of a version/generation counter, started from the current time when
+    missing, so past any value it held before being deleted or evicted
+    """
+    value: Optional[int] = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, time.time_ns(), None)
+        value = await cache.aget(key)
+    return value or time.time_ns()
+
+
+async def aget_cached_object(
+    model_meta: ModelMeta, scope: str, pk: Any, fieldset: Optional[FrozenSet[str]]
+) -> Tuple[Optional[EncodedJSON], int]:
+    """
+    Cached object, and the version of the object, to store it with on a miss:
+    entries are only served for the version they were read under
+    """
+    version_key = get_object_version_key(model_meta.model, pk)
+    key = get_object_cache_key(model_meta, scope, pk, fieldset)
+    values = await cache.aget_many([version_key, key])
+    version: Optional[int] = values.get(version_key)
+    if version is None:
+        return None, await aget_counter(version_key)
+    entry = values.get(key)
+    if entry and entry[0] == version:
+        return EncodedJSON(entry[1]), version
+    return None, version
+
+
+async def aset_cached_object(
+    model_meta: ModelMeta,
+    scope: str,
+    pk: Any,
+    fieldset: Optional[FrozenSet[str]],
+    encoded: EncodedJSON,
+    version: int,
+) -> None:
+    """
+    Store the object read under version, unless it was written since
+    """
+    if await cache.aget(get_object_version_key(model_meta.model, pk)) != version:
+        return
+    await cache.aset(
+        get_object_cache_key(model_meta, scope, pk, fieldset),
+        (version, bytes(encoded)),
+        model_meta.model_opts.cache,
+    )
+
+
+def get_generation_key(model: Type[models.Model]) -> str:
+    return f"{GENERATION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+async def aget_generation(model: Type[models.Model]) -> int:
+    """
+    Generation of the model, part of the keys of its cached pages
+    """
+    return await aget_counter(get_generation_key(model))
+
+
+def bump_generation(model: Type[models.Model]) -> None:
+    """
+    Move the model to a new generation, its cached pages are never read again
+    """
+    key = get_generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def get_list_cache_key(
+    model_meta: ModelMeta,
+    scope: str,
+    generation: int,
+    queryset: QuerySet,
+    params: Dict[str, Any],
+    page_params: Dict[str, Any],
+) -> str:
+    """
+    Cache key of a page, for the scope (controller), from the SQL of the
+    queryset paginated (whatever the filters and the service made of it),
+    sparse fieldset (fields/exclude params) and pagination params
+    """
+    try:
+        sql, sql_params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        sql, sql_params = "", ()
+    fields, exclude = params.get("fields"), params.get("exclude")
+    fieldset = model_meta.get_fieldset(
+        fields.split(",") if fields else None,
+        exclude.split(",") if exclude else None,
+    )
+    canonical = json.dumps(
+        [
+            queryset.db,
+            sql,
+            repr(sql_params),
+            get_fieldset_key(fieldset),
+            page_params,
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.md5(canonical.encode()).hexdigest()
+    label = model_meta.model._meta.label_lower
+    return (
+        f"{LIST_CACHE_KEY_PREFIX}:{label}:{model_meta.fingerprint_hash}:"
+        f"{scope}:{generation}:{digest}"
+    )
+
+
+async def aget_cached_page(
+    model_meta: ModelMeta,
+    scope: str,
+    queryset: QuerySet,
+    params: Dict[str, Any],
+    page_params: Dict[str, Any],
+    get_page: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Page of queryset for GET / of the scope (controller), read through the
+    list cache, get_page makes the (encoded) page in the DB executor on a miss,
+    stored unless the model moved to a new generation meanwhile
+    """
+    generation = await aget_generation(model_meta.model)
+    key = get_list_cache_key(
+        model_meta, scope, generation, queryset, params, page_params
+    )
+    page: Optional[Dict[str, Any]] = await cache.aget(key)
+    if page is None:
+        page = await run_in_db_executor(get_page)
+        if await aget_generation(model_meta.model) == generation:
+            await cache.aset(key, page, model_meta.model_opts.list_cache)
+    return page
+
+
+def is_cached(model: Type[models.Model]) -> bool:
+    return model in _object_cached_models or model in _list_cached_models
+
+
+def invalidate_objects(model: Type[models.Model], pks: Iterable[Any]) -> None:
+    """
+    Drop the versions of the cached objects (so their entries, whatever the
+    scope or fieldset), and the cached pages of the model, once the current
+    transaction commits
+    """
+    if not is_cached(model):
+        return
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return
+    using = router.db_for_write(model)
+    if model in _object_cached_models:
+        keys = [get_object_version_key(model, pk) for pk in pks]
+        transaction.on_commit(partial(cache.delete_many, keys), using=using)
+    if model in _list_cached_models:
+        transaction.on_commit(partial(bump_generation, model), using=using)
+
+
+def has_listeners(signal: signals.ModelSignal, sender: Any) -> bool:
+    """
+    signal.has_listeners, leaving out the receivers of the caches: the
+    ORM invalidates on its own, they must not push it off its fast paths
+    """
+    if not signal.has_listeners(sender):
+        return False
+    return any(
+        sender_key in (id(sender), id(None))
+        and not str(receiver_key).startswith(CACHE_DISPATCH_UID)
+        for (receiver_key, sender_key), *_ in signal.receivers
+    )
+
+
+def connect_cache(model_meta: ModelMeta) -> None:
+    """
+    Turn on the object cache (APIMeta cache) and/or list cache (APIMeta
+    list_cache) of the model of model_meta, invalidated on post_save,
+    post_delete, and m2m_changed of the m2m fields of the model (either side)
+    """
+    model = model_meta.model
+    connected = is_cached(model)
+    if model_meta.model_opts.cache:
+        _object_cached_models.add(model)
+    if model_meta.model_opts.list_cache:
+        _list_cached_models.add(model)
+    if connected or not is_cached(model):
+        return
+    uid = f"{CACHE_DISPATCH_UID}_{model._meta.label_lower}"
+    signals.post_save.connect(
+        _invalidate_instance, sender=model, dispatch_uid=f"{uid}_save"
+    )
+    signals.post_delete.connect(
+        _invalidate_instance, sender=model, dispatch_uid=f"{uid}_delete"
+    )
+    throughs: List[Any] = [
+        f.remote_field.through for f in model._meta.local_many_to_many
+    ]
+    throughs.extend(
+        rel.through
+        for rel in model._meta.related_objects
+        if isinstance(rel, models.ManyToManyRel)
+    )
+    for through in throughs:
+        signals.m2m_changed.connect(
+            _invalidate_m2m,
+            sender=through,
+            dispatch_uid=f"{uid}_m2m_{through._meta.label_lower}",
+        )
+
+
+def _invalidate_instance(sender: Any, instance: models.Model, **kwargs: Any) -> None:
+    invalidate_objects(sender, [instance.pk])
+
+
+def _invalidate_m2m(
+    sender: Any,
+    instance: models.Model,
+    action: str,
+    model: Type[models.Model],
+    pk_set: Optional[set],
+    **kwargs: Any,
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    # Forward side, the instance changed
+    invalidate_objects(type(instance), [instance.pk])
+    # Reverse side, the objects added to / removed from the instance changed
+    if not is_cached(model):
+        return
+    if pk_set is None:
+        # Cleared, the objects linked are only known from the through table
+        source = target = None
+        for _field in sender._meta.concrete_fields:
+            if _field.is_relation and _field.related_model is type(instance):
+                source = source or _field.attname
+            elif _field.is_relation and _field.related_model is model:
+                target = _field.attname
+        if source is None or target is None:  # pragma: no cover
+            return
+        pk_set = set(
+            sender.objects.filter(**{source: instance.pk}).values_list(
+                target, flat=True
+            )
+        )
+    invalidate_objects(model, pk_set)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict
 
 from django.conf import settings as django_settings
 from django.test.signals import setting_changed
@@ -11,11 +11,90 @@ CRUD_API_INCLUDE_APPS = getattr(django_settings, "CRUD_API_INCLUDE_APPS", [])
 # Exclude apps always got excluded
 CRUD_API_EXCLUDE_APPS = getattr(django_settings, "CRUD_API_EXCLUDE_APPS", [])
 
+# EASY API settings, restored to these defaults when unset
+EASY_API_DEFAULTS: Dict[str, Any] = {
+    # JSON encoder backend: "auto" (orjson if installed), "orjson", "stdlib",
+    # or dotted path to a easy.renderer.json.JSONBackend subclass
+    "EASY_API_JSON_BACKEND": "auto",
+    # Rows fetched and serialized at a time by streaming responses
+    "EASY_API_STREAM_CHUNK_SIZE": 2000,
+    # Levels of one relationships joined with select_related() on the read path,
+    # levels past the first one are only followed for model_recursive models
+    "EASY_API_SELECT_RELATED_DEPTH": 3,
+    # Seconds the "cached" count_strategy keeps a count
+    "EASY_API_COUNT_CACHE_TTL": 60,
+    # Read, serialize and encode the data of the generated read APIs in a single
+    # worker thread hop, handing ready to send bytes back to the event loop
+    "EASY_API_SERIALIZE_IN_WORKER": False,
+    # Worker threads of the bounded executor running the sync DB work of the
+    # async APIs, match it to the DB connection pool. 0 (or None) runs it all in
+    # the single thread sensitive sync thread
+    "EASY_API_DB_MAX_WORKERS": 10,
+    # Jobs waiting for a DB worker, past that requests are rejected with a 503
+    "EASY_API_DB_MAX_QUEUE": 100,
+    # Rows written per statement by the bulk APIs
+    "EASY_API_BULK_BATCH_SIZE": 1000,
+    # Objects DELETE /bulk may delete at once, 0 for no maximum
+    "EASY_API_BULK_DELETE_MAXIMUM": 10000,
+}
+EASY_API_JSON_BACKEND = getattr(
+    django_settings, "EASY_API_JSON_BACKEND", EASY_API_DEFAULTS["EASY_API_JSON_BACKEND"]
+)
+EASY_API_STREAM_CHUNK_SIZE = getattr(
+    django_settings,
+    "EASY_API_STREAM_CHUNK_SIZE",
+    EASY_API_DEFAULTS["EASY_API_STREAM_CHUNK_SIZE"],
+)
+
+EASY_API_SELECT_RELATED_DEPTH = getattr(
+    django_settings,
+    "EASY_API_SELECT_RELATED_DEPTH",
+    EASY_API_DEFAULTS["EASY_API_SELECT_RELATED_DEPTH"],
+)
+
+EASY_API_COUNT_CACHE_TTL = getattr(
+    django_settings,
+    "EASY_API_COUNT_CACHE_TTL",
+    EASY_API_DEFAULTS["EASY_API_COUNT_CACHE_TTL"],
+)
+
+EASY_API_SERIALIZE_IN_WORKER = getattr(
+    django_settings,
+    "EASY_API_SERIALIZE_IN_WORKER",
+    EASY_API_DEFAULTS["EASY_API_SERIALIZE_IN_WORKER"],
+)
+
+EASY_API_DB_MAX_WORKERS = getattr(
+    django_settings,
+    "EASY_API_DB_MAX_WORKERS",
+    EASY_API_DEFAULTS["EASY_API_DB_MAX_WORKERS"],
+)
+
+EASY_API_DB_MAX_QUEUE = getattr(
+    django_settings,
+    "EASY_API_DB_MAX_QUEUE",
+    EASY_API_DEFAULTS["EASY_API_DB_MAX_QUEUE"],
+)
+
+EASY_API_BULK_BATCH_SIZE = getattr(
+    django_settings,
+    "EASY_API_BULK_BATCH_SIZE",
+    EASY_API_DEFAULTS["EASY_API_BULK_BATCH_SIZE"],
+)
+
+EASY_API_BULK_DELETE_MAXIMUM = getattr(
+    django_settings,
+    "EASY_API_BULK_DELETE_MAXIMUM",
+    EASY_API_DEFAULTS["EASY_API_BULK_DELETE_MAXIMUM"],
+)
+
 
 def reload_settings(*args: Any, **kwargs: Any) -> None:  # pragma: no cover
     global settings
 
     setting, value = kwargs["setting"], kwargs["value"]
+    if value is None and setting in EASY_API_DEFAULTS:
+        value = EASY_API_DEFAULTS[setting]
     globals()[setting] = value
 
 
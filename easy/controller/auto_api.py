@@ -7,11 +7,17 @@ from ninja_extra.permissions import BasePermission
 
 from easy.controller.base import CrudAPIController
 from easy.controller.meta_conf import (
+    CACHE_ATTR,
+    COUNT_STRATEGY_ATTR,
     GENERATE_CRUD_ATTR,
+    LIST_CACHE_ATTR,
+    M2M_SIGNALS_ATTR,
     MODEL_EXCLUDE_ATTR,
     MODEL_FIELDS_ATTR,
     MODEL_JOIN_ATTR,
     MODEL_RECURSIVE_ATTR,
+    MODEL_REVERSE_RELATIONS_ATTR,
+    PAGINATION_CLASS_ATTR,
     SENSITIVE_FIELDS_ATTR,
     ModelOptions,
 )
@@ -43,7 +49,13 @@ def create_api_controller(
             MODEL_FIELDS_ATTR: model_opts.model_fields,
             MODEL_RECURSIVE_ATTR: model_opts.model_recursive,
             MODEL_JOIN_ATTR: model_opts.model_join,
-            SENSITIVE_FIELDS_ATTR: model_opts.model_fields,
+            MODEL_REVERSE_RELATIONS_ATTR: model_opts.model_reverse_relations,
+            PAGINATION_CLASS_ATTR: model_opts.pagination_class,
+            COUNT_STRATEGY_ATTR: model_opts.count_strategy,
+            M2M_SIGNALS_ATTR: model_opts.m2m_signals,
+            CACHE_ATTR: model_opts.cache,
+            LIST_CACHE_ATTR: model_opts.list_cache,
+            SENSITIVE_FIELDS_ATTR: model_opts.sensitive_fields,
         },
     )
 
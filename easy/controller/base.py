@@ -11,16 +11,24 @@ class CrudAPIController(metaclass=CrudAPIMetaclass):
     APIs auto generated:
         Creat
             PUT /{id}       - Create a single Object
+            PUT /bulk       - Create multiple Objects, in batches
+            PUT /upsert     - Create multiple Objects, or update the ones matching
+                              on ?unique_fields=a,b (must be unique together)
 
         Read
             GET /{id}       - Retrieve a single Object
             GET /           - Retrieve multiple Object, paginated, support filtering
+                              ?stream=json|ndjson streams all of them instead
+            ?fields=a,b / ?exclude=c narrow both of them to a sparse fieldset
 
         Update
             PATCH /{id}     - Update a single Object
+            PATCH /bulk     - Update multiple Objects, [{id, **changes}]
 
         Delete
             DELETE /{id}    - Delete a single Object
+            DELETE /bulk    - Delete multiple Objects, ?ids=1,2 and/or ?filters=,
+                              ?dry_run=true only counts them
 
     Configuration:
         model:              django model
@@ -29,6 +37,19 @@ class CrudAPIController(metaclass=CrudAPIMetaclass):
         model_fields:       fields to be included in Schema, default to "__all__"
         model_join:         prefetch and retrieve all m2m fields, default to False
         model_recursive:    recursively retrieve FK/OneToOne fields, default to False
+        model_reverse_relations: reverse FK/m2m relations to be retrieved,
+                            default to []
+        pagination_class:   pagination of GET /, default to limit/offset,
+                            easy.pagination.EasyCursorPagination for cursors
+        count_strategy:     count of the limit/offset pagination, "exact" (default),
+                            "cached", "estimated" or "has_more"
+        m2m_signals:        send m2m_changed on m2m writes, default to True
+        cache:              seconds GET /{id} responses are cached, default to None
+                            (no cache), invalidated on writes, shared by
+                            all the requests (per user querysets not allowed)
+        list_cache:         seconds GET / pages are cached, default to None (no
+                            cache), invalidated on writes to the model, shared
+                            by all the requests (per user querysets not allowed)
         sensitive_fields:   fields to be ignored
 
     Example:
@@ -39,6 +60,12 @@ class CrudAPIController(metaclass=CrudAPIMetaclass):
             model_fields = ["field1", "field2"]
             model_join = False
             model_recursive = True
+            model_reverse_relations = ["client_set"]
+            pagination_class = EasyCursorPagination
+            count_strategy = "cached"
+            m2m_signals = False
+            cache = 300
+            list_cache = 60
             sensitive_fields = ["token", "money"]
     """
 
@@ -4,43 +4,130 @@ import re
 import uuid
 from abc import ABC, ABCMeta
 from collections import ChainMap
-from typing import Any, List, Match, Optional, Tuple, Type
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Match,
+    Optional,
+    Tuple,
+    Type,
+)
 
+from django.core.exceptions import FieldError, ValidationError as DjangoValidationError
 from django.http import HttpRequest
 from ninja import ModelSchema
 from ninja_extra import ControllerBase, http_delete, http_get, http_patch, http_put
+from ninja_extra.context import RouteContext
 from ninja_extra.exceptions import ValidationError
 from ninja_extra.pagination import paginate
 
-from easy.controller.meta_conf import MODEL_FIELDS_ATTR_DEFAULT, ModelOptions
+from easy.cache import connect_cache, get_cache_scope
+from easy.conf import settings as easy_settings
+from easy.controller.meta_conf import (
+    ModelMeta,
+    ModelMetaRegistry,
+    ModelOptions,
+    set_request_model_meta,
+)
 from easy.domain.meta import CrudModel
-from easy.response import BaseAPIResponse
+from easy.exception import APIServiceUnavailableException
+from easy.pagination import EasyLimitOffsetPagination
+from easy.response import (
+    STREAM_FORMAT_JSON,
+    STREAM_FORMAT_NDJSON,
+    BaseAPIResponse,
+    QuerySetStream,
+)
 from easy.services import BaseService
 from easy.utils import copy_func
 
 logger = logging.getLogger(__name__)
 
 
+def get_fieldset(
+    model_meta: ModelMeta, fields: Optional[str], exclude: Optional[str]
+) -> Optional[FrozenSet[str]]:
+    """
+    Sparse fieldset of the comma separated fields/exclude query params
+    """
+    try:
+        return model_meta.get_fieldset(
+            fields.split(",") if fields else None,
+            exclude.split(",") if exclude else None,
+        )
+    except ValueError as exc:
+        raise ValidationError(
+            detail=f"Bad fields, please check carefully. {exc}",
+            code=400,
+        )
+
+
+def get_filters(filters: Optional[str]) -> Dict[str, Any]:
+    """
+    Django orm filters of the JSON filters query param
+    """
+    if not filters:
+        return {}
+    try:
+        _filters: Dict[str, Any] = json.loads(filters)
+    except Exception as exc:  # pragma: no cover
+        raise ValidationError(
+            detail=f"Bad filter, please check carefully. {exc}",
+            code=402,
+        )
+    if not isinstance(_filters, dict):
+        raise ValidationError(
+            detail="Bad filter, please check carefully. A JSON object is expected.",
+            code=400,
+        )
+    return _filters
+
+
 class CrudAPI(CrudModel, ABC):
+    # Registered by CrudAPIMetaclass, shared by every request, never installed
+    # on the model: handed to the service, and to the serializer on the request
+    model_meta: Optional[ModelMeta] = None
+    # Scope of the cache entries made by the controller
+    cache_scope: str = ""
+    _context: Optional[RouteContext] = None
+
     # Never add type note to service, it will cause injection error
     def __init__(self, service=None):  # type: ignore
-        # Critical to set __Meta
         self.service = service
 
-        _model_opts: ModelOptions = ModelOptions.get_model_options(self.APIMeta)
-        if self.model and _model_opts:
-            ModelOptions.set_model_meta(self.model, _model_opts)
-
         if not service:
-            self.service = BaseService(model=self.model)
+            self.service = BaseService(model=self.model, model_meta=self.model_meta)
+        elif self.model_meta and getattr(service, "model", None) is self.model:
+            # Services are created per controller instance by the injector
+            service.model_meta = self.model_meta
         super().__init__(model=self.model)
 
+    @property
+    def context(self) -> Optional[RouteContext]:
+        return self._context
+
+    @context.setter
+    def context(self, context: Optional[RouteContext]) -> None:
+        """
+        Set by ninja-extra around each route call, the model_meta the
+        responses of the controller are serialized with goes on the request
+        """
+        self._context = context
+        if context and context.request is not None and self.model_meta:
+            set_request_model_meta(context.request, self.model_meta)
+
 
 class CrudAPIMetaclass(ABCMeta):
     def __new__(mcs, name: str, bases: Tuple[Type[Any], ...], attrs: dict) -> Any:
         # Get configs from APIMeta
         attrs_meta = attrs.get("APIMeta", None)
         model_opts: ModelOptions = ModelOptions.get_model_options(attrs_meta)
+        cache_scope = get_cache_scope(
+            f"{attrs.get('__module__')}.{attrs.get('__qualname__', name)}"
+        )
 
         # Get all attrs from parents excluding private ones
         def is_private_attrs(attr_name: str) -> Optional[Match[str]]:
@@ -57,13 +144,29 @@ class CrudAPIMetaclass(ABCMeta):
         base_cls_attrs.update(parent_attrs)
 
         # Define Controller APIs for auto generation
-        async def get_obj(self, request: HttpRequest, id: int) -> Any:  # type: ignore
+        async def get_obj(  # type: ignore
+            self,
+            request: HttpRequest,
+            id: int,
+            fields: Optional[str] = None,
+            exclude: Optional[str] = None,
+        ) -> Any:
             """
-            GET /{id}
-            Retrieve a single Object
+            GET /{id}?fields={field1,field2}&exclude={field3}
+            Retrieve a single Object (optional: sparse fieldset, pk always included)
             """
+            fieldset = get_fieldset(self.model_meta, fields, exclude)
             try:
-                qs = await self.service.get_obj(id)
+                if self.model_meta.model_opts.cache:
+                    qs = await self.service.get_obj_cached(
+                        id, fieldset=fieldset, scope=self.cache_scope
+                    )
+                elif easy_settings.EASY_API_SERIALIZE_IN_WORKER:
+                    qs = await self.service.get_obj_encoded(id, fieldset=fieldset)
+                else:
+                    qs = await self.service.get_obj(id, fieldset=fieldset)
+            except APIServiceUnavailableException:
+                raise
             except Exception as e:  # pragma: no cover
                 logger.error(f"Get Error - {e}", exc_info=True)
                 return BaseAPIResponse(str(e), message="Get Failed", code=500)
@@ -82,58 +185,75 @@ class CrudAPIMetaclass(ABCMeta):
             else:
                 return BaseAPIResponse("Not Found.", code=404)
 
-        @paginate
-        async def get_objs(self, request: HttpRequest, filters: Optional[str] = None) -> Any:  # type: ignore
+        async def del_objs(  # type: ignore
+            self,
+            request: HttpRequest,
+            ids: Optional[str] = None,
+            filters: Optional[str] = None,
+            dry_run: bool = False,
+        ) -> Any:
             """
-            GET /?filters={filters_dict}
-            Retrieve multiple Object (optional: django filters)
+            DELETE /bulk?ids={id1,id2}&filters={filters_dict}&dry_run={true|false}
+            Delete multiple Objects, by ids and/or django filters, in one statement
+            dry_run: only count the objects to be deleted
+            Up to EASY_API_BULK_DELETE_MAXIMUM objects, deleted counts per model
             """
-            if filters:
+            _filters = get_filters(filters)
+            if ids:
                 try:
-                    _filters = json.loads(filters)
-                except Exception as exc:  # pragma: no cover
+                    _filters["pk__in"] = [int(_id) for _id in ids.split(",")]
+                except ValueError as exc:
                     raise ValidationError(
-                        detail=f"Bad filter, please check carefully. {exc}",
-                        code=402,
+                        detail=f"Bad ids, please check carefully. {exc}", code=400
                     )
-                return await self.service.get_objs(**_filters)
-            return await self.service.get_objs()
+            if not _filters:
+                raise ValidationError(detail="ids or filters required.", code=400)
+            try:
+                count, deleted = await self.service.bulk_del_objs(
+                    dry_run=dry_run, **_filters
+                )
+            except (FieldError, DjangoValidationError, TypeError) as exc:
+                raise ValidationError(
+                    detail=f"Bad filters, please check carefully. {exc}", code=400
+                )
+            except ValueError as exc:
+                raise ValidationError(detail=str(exc), code=400)
+            if dry_run:
+                return BaseAPIResponse({"count": count}, message="Dry run.")
+            return BaseAPIResponse(
+                {"count": count, "deleted": deleted}, message="Deleted."
+            )
+
+        async def get_objs(  # type: ignore
+            self,
+            request: HttpRequest,
+            filters: Optional[str] = None,
+            fields: Optional[str] = None,
+            exclude: Optional[str] = None,
+            stream: Optional[Literal[STREAM_FORMAT_JSON, STREAM_FORMAT_NDJSON]] = None,  # type: ignore
+        ) -> Any:
+            """
+            GET /?filters={filters_dict}&fields={field1,field2}&stream={json|ndjson}
+            Retrieve multiple Object (optional: django filters, sparse fieldset)
+            fields/exclude: fields to be retrieved/left out, pk always included
+            stream: export all objects, streamed instead of paginated
+            """
+            fieldset = get_fieldset(self.model_meta, fields, exclude)
+            _filters = get_filters(filters)
+            qs = await self.service.get_objs(fieldset=fieldset, **_filters)
+            if stream:
+                return QuerySetStream(qs, stream_format=stream)
+            return qs
 
         if model_opts.generate_crud and model_opts.model:
-            base_cls_attrs.update(
-                {
-                    "get_obj": http_get("/{id}", summary="Get a single object")(
-                        copy_func(get_obj)  # type: ignore
-                    ),
-                    "del_obj": http_delete("/{id}", summary="Delete a single object")(
-                        copy_func(del_obj)  # type: ignore
-                    ),
-                    "get_objs": http_get("/", summary="Get multiple objects")(
-                        copy_func(get_objs)  # type: ignore
-                    ),
-                }
-            )
+            # The fields written by the model meta (write_plan)
+            model_meta = ModelMetaRegistry.register(model_opts.model, model_opts)
 
             class DataSchema(ModelSchema):
-                # ninja 1.x ModelSchema requires `Meta` (not `Config`), and
-                # `fields`/`exclude` (not `model_fields`/`model_exclude`).
+                # ninja 1.x ModelSchema requires `Meta` (not `Config`)
                 class Meta:
                     model = model_opts.model
-                    exclude: List = []
-                    if model_opts.model_exclude:
-                        exclude.extend(model_opts.model_exclude)
-                        # Remove pk(id) from Create/Update Schema
-                        exclude.extend([model._meta.pk.name])  # type: ignore
-                    else:
-                        if model_opts.model_fields == MODEL_FIELDS_ATTR_DEFAULT:
-                            # Remove pk(id) from Create/Update Schema
-                            exclude.extend([model._meta.pk.name])  # type: ignore
-                        else:
-                            fields = (
-                                model_opts.model_fields
-                                if model_opts.model_fields
-                                else MODEL_FIELDS_ATTR_DEFAULT
-                            )
+                    fields = list(model_meta.schema_fields)
 
             async def add_obj(  # type: ignore
                 self, request: HttpRequest, data: DataSchema
@@ -150,14 +270,69 @@ class CrudAPIMetaclass(ABCMeta):
                         code=204, message="Add failed."
                     )  # pragma: no cover
 
+            async def add_objs(  # type: ignore
+                self, request: HttpRequest, data: List[DataSchema]
+            ) -> Any:
+                """
+                PUT /bulk
+                Create multiple Objects, in batches (bulk_create)
+                """
+                obj_ids = await self.service.bulk_add_objs(
+                    [item.dict() for item in data]
+                )
+                return BaseAPIResponse({"ids": obj_ids}, code=201, message="Created.")
+
+            async def upsert_objs(  # type: ignore
+                self, request: HttpRequest, unique_fields: str, data: List[DataSchema]
+            ) -> Any:
+                """
+                PUT /upsert?unique_fields={field1,field2}
+                Create multiple Objects, or update the ones matching on unique_fields
+                """
+                try:
+                    obj_ids = await self.service.bulk_upsert_objs(
+                        [item.dict(exclude_unset=True) for item in data],
+                        unique_fields.split(","),
+                    )
+                except ValueError as exc:
+                    raise ValidationError(
+                        detail=f"Bad unique_fields, please check carefully. {exc}",
+                        code=400,
+                    )
+                return BaseAPIResponse({"ids": obj_ids}, message="Upserted.")
+
+            class PatchSchema(ModelSchema):
+                class Meta(DataSchema.Meta):
+                    fields_optional = "__all__"
+
+            class BulkPatchSchema(PatchSchema):
+                id: int
+
+            async def patch_objs(  # type: ignore
+                self, request: HttpRequest, data: List[BulkPatchSchema]
+            ) -> Any:
+                """
+                PATCH /bulk
+                Update multiple objects, [{id, **changes}], only the fields set
+                """
+                obj_ids = await self.service.bulk_patch_objs(
+                    [item.dict(exclude_unset=True) for item in data]
+                )
+                not_found = sorted({item.id for item in data} - set(obj_ids))
+                return BaseAPIResponse(
+                    {"ids": obj_ids, "not_found": not_found}, message="Updated."
+                )
+
             async def patch_obj(  # type: ignore
-                self, request: HttpRequest, id: int, data: DataSchema
+                self, request: HttpRequest, id: int, data: PatchSchema
             ) -> Any:
                 """
                 PATCH /{id}
-                Update a single object
+                Update a single object, only the fields set
                 """
-                if await self.service.patch_obj(id=id, payload=data.dict()):
+                if await self.service.patch_obj(
+                    id=id, payload=data.dict(exclude_unset=True)
+                ):
                     return BaseAPIResponse(message="Updated.")
                 else:
                     return BaseAPIResponse(code=400, message="Updated Failed")
@@ -165,9 +340,49 @@ class CrudAPIMetaclass(ABCMeta):
             DataSchema.__name__ = (
                 f"{model_opts.model.__name__}__AutoSchema({str(uuid.uuid4())[:4]})"
             )
+            PatchSchema.__name__ = (
+                f"{model_opts.model.__name__}__PatchSchema({str(uuid.uuid4())[:4]})"
+            )
+            BulkPatchSchema.__name__ = (
+                f"{model_opts.model.__name__}__BulkPatchSchema({str(uuid.uuid4())[:4]})"
+            )
 
+            # Pages cached per controller, see APIMeta.list_cache
+            paginator_params: Dict[str, Any] = (
+                {"cache_scope": cache_scope} if model_opts.list_cache else {}
+            )
             base_cls_attrs.update(
                 {
+                    # /bulk, /upsert routes go first, /{id} would match them otherwise
+                    "add_objs": http_put("/bulk", summary="Create multiple objects")(
+                        copy_func(add_objs)  # type: ignore
+                    ),
+                    "upsert_objs": http_put(
+                        "/upsert", summary="Create or update multiple objects"
+                    )(
+                        copy_func(upsert_objs)  # type: ignore
+                    ),
+                    "patch_objs": http_patch("/bulk", summary="Patch multiple objects")(
+                        copy_func(patch_objs)  # type: ignore
+                    ),
+                    "del_objs": http_delete("/bulk", summary="Delete multiple objects")(
+                        copy_func(del_objs)  # type: ignore
+                    ),
+                    "get_obj": http_get("/{id}", summary="Get a single object")(
+                        copy_func(get_obj)  # type: ignore
+                    ),
+                    "del_obj": http_delete("/{id}", summary="Delete a single object")(
+                        copy_func(del_obj)  # type: ignore
+                    ),
+                    "get_objs": http_get("/", summary="Get multiple objects")(
+                        copy_func(
+                            paginate(
+                                model_opts.pagination_class
+                                or EasyLimitOffsetPagination,
+                                **paginator_params,
+                            )(get_objs)
+                        )  # type: ignore
+                    ),
                     "patch_obj": http_patch("/{id}", summary="Patch a single object")(
                         copy_func(patch_obj)  # type: ignore
                     ),
@@ -177,6 +392,9 @@ class CrudAPIMetaclass(ABCMeta):
                 }
             )
 
+        # ControllerBase.context would hide the one of CrudAPI otherwise
+        base_cls_attrs["context"] = vars(CrudAPI)["context"]
+
         new_cls: Type = super().__new__(
             mcs,
             name,
@@ -188,7 +406,11 @@ class CrudAPIMetaclass(ABCMeta):
         )
 
         if model_opts.model:
-            ModelOptions.set_model_meta(model_opts.model, model_opts)
+            model_meta = ModelMetaRegistry.register(model_opts.model, model_opts)
+            setattr(new_cls, "cache_scope", cache_scope)
+            if model_opts.cache or model_opts.list_cache:
+                connect_cache(model_meta)
             setattr(new_cls, "model", model_opts.model)
+            setattr(new_cls, "model_meta", model_meta)
 
         return new_cls
@@ -1,8 +1,26 @@
-from typing import Any, List, Optional, Type, Union
+import hashlib
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.db import models
+from django.utils.functional import cached_property
 
 META_ATTRIBUTE_NAME: str = "_easy_api_meta_"
+MODEL_META_ATTRIBUTE_NAME: str = "_easy_api_model_meta_"
+# ModelMeta of the controller handling a request, set on the request
+REQUEST_MODEL_META_ATTRIBUTE_NAME: str = "easy_api_model_meta"
 
 GENERATE_CRUD_ATTR: str = "generate_crud"
 GENERATE_CRUD_ATTR_DEFAULT = True
@@ -19,9 +37,53 @@ MODEL_RECURSIVE_ATTR_DEFAULT: bool = False
 MODEL_JOIN_ATTR: str = "model_join"
 MODEL_JOIN_ATTR_DEFAULT: bool = False
 
+MODEL_REVERSE_RELATIONS_ATTR: str = "model_reverse_relations"
+MODEL_REVERSE_RELATIONS_ATTR_DEFAULT: List = []
+
+COUNT_STRATEGY_EXACT: str = "exact"
+COUNT_STRATEGY_CACHED: str = "cached"
+COUNT_STRATEGY_ESTIMATED: str = "estimated"
+COUNT_STRATEGY_HAS_MORE: str = "has_more"
+COUNT_STRATEGIES: Tuple[str, ...] = (
+    COUNT_STRATEGY_EXACT,
+    COUNT_STRATEGY_CACHED,
+    COUNT_STRATEGY_ESTIMATED,
+    COUNT_STRATEGY_HAS_MORE,
+)
+
+COUNT_STRATEGY_ATTR: str = "count_strategy"
+COUNT_STRATEGY_ATTR_DEFAULT: str = COUNT_STRATEGY_EXACT
+
+PAGINATION_CLASS_ATTR: str = "pagination_class"
+PAGINATION_CLASS_ATTR_DEFAULT: Optional[Type] = None
+
+M2M_SIGNALS_ATTR: str = "m2m_signals"
+M2M_SIGNALS_ATTR_DEFAULT: bool = True
+
+CACHE_ATTR: str = "cache"
+CACHE_ATTR_DEFAULT: Optional[int] = None
+
+LIST_CACHE_ATTR: str = "list_cache"
+LIST_CACHE_ATTR_DEFAULT: Optional[int] = None
+
 SENSITIVE_FIELDS_ATTR: str = "sensitive_fields"
 SENSITIVE_FIELDS_ATTR_DEFAULT: List = ["password", "token"]
 
+# pre_save of the Django fields, only changing the value of auto_now fields
+# (and uncommitted files, never given by API payloads) on updates
+BUILTIN_PRE_SAVES: Tuple[Callable, ...] = (
+    models.Field.pre_save,
+    models.DateField.pre_save,
+    models.DateTimeField.pre_save,
+    models.TimeField.pre_save,
+    models.FileField.pre_save,
+)
+
+# Serialization plan field kinds
+FIELD_KIND_VALUE: str = "value"
+FIELD_KIND_ONE: str = "one"
+FIELD_KIND_MANY: str = "many"
+
 
 class ModelOptions:
     def __init__(self, options: Optional[object] = None):
@@ -44,6 +106,29 @@ class ModelOptions:
         self.model_recursive: Optional[Union[bool]] = getattr(
             options, MODEL_RECURSIVE_ATTR, MODEL_RECURSIVE_ATTR_DEFAULT
         )
+        self.model_reverse_relations: List[str] = getattr(
+            options,
+            MODEL_REVERSE_RELATIONS_ATTR,
+            list(MODEL_REVERSE_RELATIONS_ATTR_DEFAULT),
+        )
+        self.count_strategy: str = getattr(
+            options, COUNT_STRATEGY_ATTR, COUNT_STRATEGY_ATTR_DEFAULT
+        )
+        if self.count_strategy not in COUNT_STRATEGIES:
+            raise ImproperlyConfigured(
+                f"Unknown {COUNT_STRATEGY_ATTR}: {self.count_strategy!r}, "
+                f"expected one of {', '.join(COUNT_STRATEGIES)}"
+            )
+        self.pagination_class: Optional[Type] = getattr(
+            options, PAGINATION_CLASS_ATTR, PAGINATION_CLASS_ATTR_DEFAULT
+        )
+        self.m2m_signals: bool = getattr(
+            options, M2M_SIGNALS_ATTR, M2M_SIGNALS_ATTR_DEFAULT
+        )
+        self.cache: Optional[int] = getattr(options, CACHE_ATTR, CACHE_ATTR_DEFAULT)
+        self.list_cache: Optional[int] = getattr(
+            options, LIST_CACHE_ATTR, LIST_CACHE_ATTR_DEFAULT
+        )
         self.sensitive_fields: Optional[Union[str, List[str]]] = getattr(
             options, SENSITIVE_FIELDS_ATTR, list(SENSITIVE_FIELDS_ATTR_DEFAULT)
         )
@@ -56,21 +141,446 @@ class ModelOptions:
     def set_model_meta(
         cls, model: Type[models.Model], model_opts: "ModelOptions"
     ) -> None:
-        setattr(
-            model,
-            META_ATTRIBUTE_NAME,
-            {
-                GENERATE_CRUD_ATTR: model_opts.generate_crud,
-                MODEL_EXCLUDE_ATTR: model_opts.model_exclude,
-                MODEL_FIELDS_ATTR: model_opts.model_fields,
-                MODEL_RECURSIVE_ATTR: model_opts.model_recursive,
-                MODEL_JOIN_ATTR: model_opts.model_join,
-                SENSITIVE_FIELDS_ATTR: model_opts.sensitive_fields,
-            },
+        ModelMetaRegistry.register(model, model_opts).activate()
+
+    def get_meta_dict(self) -> Dict[str, Any]:
+        return {
+            GENERATE_CRUD_ATTR: self.generate_crud,
+            MODEL_EXCLUDE_ATTR: self.model_exclude,
+            MODEL_FIELDS_ATTR: self.model_fields,
+            MODEL_RECURSIVE_ATTR: self.model_recursive,
+            MODEL_JOIN_ATTR: self.model_join,
+            MODEL_REVERSE_RELATIONS_ATTR: self.model_reverse_relations,
+            PAGINATION_CLASS_ATTR: self.pagination_class,
+            COUNT_STRATEGY_ATTR: self.count_strategy,
+            M2M_SIGNALS_ATTR: self.m2m_signals,
+            CACHE_ATTR: self.cache,
+            LIST_CACHE_ATTR: self.list_cache,
+            SENSITIVE_FIELDS_ATTR: self.sensitive_fields,
+        }
+
+    def get_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Hashable representation of the options, used as registry key
+        """
+
+        def freeze(value: Any) -> Any:
+            if isinstance(value, (list, tuple, set)):
+                return tuple(freeze(v) for v in value)
+            return value
+
+        return tuple((k, freeze(v)) for k, v in sorted(self.get_meta_dict().items()))
+
+
+class PlanField(NamedTuple):
+    name: str
+    kind: str
+    field: Any
+
+
+class ValuesPlanField(NamedTuple):
+    name: str
+    kind: str
+    lookup: str
+    converter: Optional[Callable[[Any], Any]]
+
+
+class WritePlanField(NamedTuple):
+    kind: str
+    target: str
+
+
+class ModelMeta:
+    """
+    Resolved APIMeta options and field tables of a model.
+    Compiled once when the model is registered, and shared by every request.
+    """
+
+    def __init__(self, model: Type[models.Model], model_opts: ModelOptions):
+        self.model = model
+        self.model_opts = model_opts
+        self.meta: Dict[str, Any] = model_opts.get_meta_dict()
+        self._loaded_plans: Dict[FrozenSet[str], Tuple[PlanField, ...]] = {}
+
+    @cached_property
+    def fingerprint_hash(self) -> str:
+        """
+        Short stable hash of the options, e.g. to key what they shape in caches
+        """
+        fingerprint = repr(self.model_opts.get_fingerprint()).encode()
+        return hashlib.md5(fingerprint).hexdigest()[:12]
+
+    @cached_property
+    def excluded_fields(self) -> FrozenSet[str]:
+        """sensitive_fields (including defaults) plus model_exclude"""
+        excluded = set(SENSITIVE_FIELDS_ATTR_DEFAULT)
+        if self.model_opts.sensitive_fields:
+            excluded.update(self.model_opts.sensitive_fields)
+        if self.model_opts.model_exclude:
+            excluded.update(self.model_opts.model_exclude)
+        return frozenset(excluded)
+
+    @cached_property
+    def m2m_fields(self) -> List[models.ManyToManyField]:
+        return [
+            _field
+            for _field in self.model._meta.get_fields(include_hidden=True)
+            if isinstance(_field, models.ManyToManyField)
+            and _field.name not in self.excluded_fields
+        ]
+
+    @cached_property
+    def fk_fields(self) -> List[models.ForeignKey]:
+        """Forward ForeignKey/OneToOne fields"""
+        return [
+            _field
+            for _field in self.model._meta.get_fields()
+            if isinstance(_field, models.ForeignKey)
+        ]
+
+    @cached_property
+    def reverse_fields(self) -> List[models.ForeignObjectRel]:
+        """Reverse relations: ManyToOneRel, OneToOneRel, ManyToManyRel"""
+        return [
+            _field
+            for _field in self.model._meta.get_fields()
+            if isinstance(_field, models.ForeignObjectRel)
+        ]
+
+    @cached_property
+    def reverse_many_fields(self) -> List[models.ForeignObjectRel]:
+        """
+        Reverse ForeignKey/ManyToMany relations listed in model_reverse_relations,
+        by relation or accessor name
+        """
+        names = set(self.model_opts.model_reverse_relations or [])
+        return [
+            _field
+            for _field in self.reverse_fields
+            if isinstance(_field, (models.ManyToOneRel, models.ManyToManyRel))
+            and not isinstance(_field, models.OneToOneRel)
+            and (_field.name in names or _field.get_accessor_name() in names)
+            and _field.name not in self.excluded_fields
+        ]
+
+    def show_field(self, field_name: str) -> bool:
+        if field_name in self.excluded_fields:
+            return False
+        if not self.model_opts.model_exclude:
+            model_fields = self.model_opts.model_fields
+            if model_fields != MODEL_FIELDS_ATTR_DEFAULT:
+                if field_name not in model_fields:
+                    return False
+        return True
+
+    @cached_property
+    def serialization_plan(self) -> Tuple[PlanField, ...]:
+        """
+        Visible fields and how to serialize each of them.
+        Many relationships are all emitted from the prefetch cache, so only the
+        first visible one is kept in the plan.
+        """
+        plan = []
+        has_many = False
+        for _field in self.model._meta.get_fields():
+            if not self.show_field(_field.name):
+                continue
+            if isinstance(_field, (models.ForeignKey, models.OneToOneRel)):
+                plan.append(PlanField(_field.name, FIELD_KIND_ONE, _field))
+            elif isinstance(
+                _field,
+                (models.ManyToManyRel, models.ManyToManyField, models.ManyToOneRel),
+            ):
+                if not has_many:
+                    plan.append(PlanField(_field.name, FIELD_KIND_MANY, _field))
+                    has_many = True
+            else:
+                plan.append(PlanField(_field.name, FIELD_KIND_VALUE, _field))
+        return tuple(plan)
+
+    @cached_property
+    def one_fields(self) -> Tuple[Any, ...]:
+        """Visible one relationships (ForeignKey, OneToOne, reverse OneToOne)"""
+        return tuple(
+            f for _, kind, f in self.serialization_plan if kind == FIELD_KIND_ONE
+        )
+
+    def get_select_related(self, depth: int) -> List[str]:
+        """
+        select_related() lookups of the one relationships read when serializing,
+        followed into the related models while model_recursive, up to depth.
+        Without model_recursive, only the reverse OneToOne are joined, the
+        ForeignKey/OneToOne ids are read from their own column (attname).
+        """
+        lookups: List[str] = []
+        if depth < 1:
+            return lookups
+        for _field in self.one_fields:
+            if not self.model_opts.model_recursive and isinstance(
+                _field, models.ForeignKey
+            ):
+                continue
+            lookups.append(_field.name)
+            if self.model_opts.model_recursive:
+                related_meta = ModelMetaRegistry.get_model_meta(_field.related_model)
+                lookups.extend(
+                    f"{_field.name}__{lookup}"
+                    for lookup in related_meta.get_select_related(depth - 1)
+                )
+        return lookups
+
+    @cached_property
+    def values_plan(self) -> Optional[Tuple[ValuesPlanField, ...]]:
+        """
+        serialization_plan expressed as a values() projection (FK as its id),
+        None if some visible field can not be read with values()
+        """
+        plan = []
+        for name, kind, _field in self.serialization_plan:
+            lookup = name
+            converter = None
+            if kind == FIELD_KIND_ONE:
+                if isinstance(_field, models.ForeignKey):
+                    if _field.target_field == _field.related_model._meta.pk:
+                        lookup = _field.attname
+                    else:
+                        lookup = f"{name}__pk"
+            elif kind == FIELD_KIND_VALUE:
+                if not getattr(_field, "concrete", False) or _field.is_relation:
+                    return None
+                if isinstance(_field, models.FileField):
+                    converter = partial(_field.attr_class, None, _field)
+            plan.append(ValuesPlanField(name, kind, lookup, converter))
+        return tuple(plan)
+
+    @cached_property
+    def deferred_fields(self) -> Tuple[str, ...]:
+        """
+        Columns never serialized (sensitive, excluded or not in model_fields),
+        left in the database by the read path
+        """
+        return tuple(
+            _field.name
+            for _field in self.model._meta.concrete_fields
+            if not _field.primary_key and not self.show_field(_field.name)
         )
 
+    @cached_property
+    def plan_attnames(self) -> FrozenSet[str]:
+        """Attnames of the local columns read by serialization_plan"""
+        return frozenset(
+            f.field.attname
+            for f in self.serialization_plan
+            if getattr(f.field, "concrete", False) and not f.field.many_to_many
+        )
+
+    @cached_property
+    def fieldset_names(self) -> FrozenSet[str]:
+        """
+        Keys a response can be narrowed to with a sparse fieldset
+        """
+        names = {
+            name for name, kind, _ in self.serialization_plan if kind != FIELD_KIND_MANY
+        }
+        names.update(f.name for f in self.m2m_fields if self.show_field(f.name))
+        names.update(str(f.get_accessor_name()) for f in self.reverse_many_fields)
+        return frozenset(names)
+
+    def get_fieldset(
+        self, fields: Optional[List[str]] = None, exclude: Optional[List[str]] = None
+    ) -> Optional[FrozenSet[str]]:
+        """
+        Sparse fieldset of the requested fields (all of them if not given) minus
+        the excluded ones, None if no narrowing was requested
+        """
+        if not fields and not exclude:
+            return None
+        unknown = set(fields or []).union(exclude or []) - self.fieldset_names
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return frozenset(fields or self.fieldset_names).difference(exclude or [])
+
+    def get_loaded_plan(self, loaded: FrozenSet[str]) -> Tuple[PlanField, ...]:
+        """
+        serialization_plan narrowed to the loaded fields (and the pk), many
+        relationships are emitted from whatever was prefetched
+        """
+        plan = self._loaded_plans.get(loaded)
+        if plan is None:
+            pk_name = self.model._meta.pk.name
+            plan = tuple(
+                f
+                for f in self.serialization_plan
+                if f.kind == FIELD_KIND_MANY or f.name in loaded or f.name == pk_name
+            )
+            self._loaded_plans[loaded] = plan
+        return plan
+
+    @cached_property
+    def auto_now_fields(self) -> Tuple[Any, ...]:
+        """
+        auto_now fields, set by their pre_save on every save
+        """
+        return tuple(
+            _field
+            for _field in self.model._meta.concrete_fields
+            if getattr(_field, "auto_now", False)
+            and type(_field).pre_save in BUILTIN_PRE_SAVES
+        )
+
+    @cached_property
+    def custom_pre_save_fields(self) -> Tuple[Any, ...]:
+        """
+        Fields with a pre_save of their own, whose value may depend on the
+        other fields of the object
+        """
+        return tuple(
+            _field
+            for _field in self.model._meta.concrete_fields
+            if type(_field).pre_save not in BUILTIN_PRE_SAVES
+        )
+
+    @cached_property
+    def custom_save(self) -> bool:
+        """
+        Whether the model overrides Model.save()
+        """
+        return self.model.save is not models.Model.save
+
+    @cached_property
+    def schema_fields(self) -> Tuple[str, ...]:
+        """
+        Fields of the create/update schemas: model_fields, or all the local and
+        m2m fields but model_exclude, the pk only if listed in model_fields
+        """
+        pk_name = self.model._meta.pk.name
+        names = [
+            _field.name
+            for _field in self.model._meta.concrete_fields
+            + self.model._meta.many_to_many
+        ]
+        model_fields = self.model_opts.model_fields
+        if self.model_opts.model_exclude:
+            excluded = set(self.model_opts.model_exclude) | {pk_name}
+            return tuple(name for name in names if name not in excluded)
+        if not model_fields or model_fields == MODEL_FIELDS_ATTR_DEFAULT:
+            return tuple(name for name in names if name != pk_name)
+        return tuple(name for name in names if name in model_fields)
+
+    @cached_property
+    def write_plan(self) -> Dict[str, WritePlanField]:
+        """
+        Payload keys accepted by the write path, the schema_fields and the pk:
+        local columns (FK by name or attname) to their attname, m2m fields to
+        their name
+        """
+        names = set(self.schema_fields) | {self.model._meta.pk.name}
+        plan = {}
+        for _field in self.model._meta.concrete_fields:
+            if _field.name in names:
+                kind = FIELD_KIND_ONE if _field.is_relation else FIELD_KIND_VALUE
+                plan[_field.name] = plan[_field.attname] = WritePlanField(
+                    kind, _field.attname
+                )
+        for _field in self.model._meta.many_to_many:
+            if _field.name in names:
+                plan[_field.name] = WritePlanField(FIELD_KIND_MANY, _field.name)
+        return plan
+
+    def split_payload(self, payload: Dict[str, Any]) -> Tuple[Dict, Dict]:
+        """
+        Split a write payload into its local columns (by attname) and m2m fields
+        """
+        plan = self.write_plan
+        local_fields, m2m_fields = {}, {}
+        for key, value in payload.items():
+            try:
+                kind, target = plan[key]
+            except KeyError:
+                raise FieldDoesNotExist(
+                    f"{self.model.__name__} has no writable field named '{key}'"
+                )
+            if kind == FIELD_KIND_MANY:
+                m2m_fields[target] = value
+            else:
+                local_fields[target] = value
+        return local_fields, m2m_fields
+
+    def activate(self) -> None:
+        """
+        Make this the default configuration of the model, for the data
+        serialized without a ModelMeta given (see ModelOptions.set_model_meta)
+        """
+        if getattr(self.model, MODEL_META_ATTRIBUTE_NAME, None) is not self:
+            setattr(self.model, META_ATTRIBUTE_NAME, self.meta)
+            setattr(self.model, MODEL_META_ATTRIBUTE_NAME, self)
+
+
+class ModelMetaRegistry:
+    """
+    Process wide registry of ModelMeta, keyed by model and options fingerprint
+    """
+
+    _registry: Dict[Tuple[Type[models.Model], Tuple[Any, ...]], ModelMeta] = {}
+
+    @classmethod
+    def register(cls, model: Type[models.Model], model_opts: ModelOptions) -> ModelMeta:
+        key = (model, model_opts.get_fingerprint())
+        model_meta = cls._registry.get(key)
+        if model_meta is None:
+            model_meta = cls._registry.setdefault(key, ModelMeta(model, model_opts))
+        return model_meta
+
+    @classmethod
+    def get_model_meta(
+        cls, model: Type[models.Model], model_meta: Optional[ModelMeta] = None
+    ) -> ModelMeta:
+        """
+        model_meta if given for the model (e.g. the one of a controller),
+        otherwise the default one of the model, default options if none was set
+        """
+        if model_meta is not None and model_meta.model is model:
+            return model_meta
+        default: Optional[ModelMeta] = getattr(model, MODEL_META_ATTRIBUTE_NAME, None)
+        if default is None:
+            default = cls.register(model, ModelOptions())
+        return default
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._registry.clear()
+
+
+def set_request_model_meta(request: Any, model_meta: ModelMeta) -> None:
+    setattr(request, REQUEST_MODEL_META_ATTRIBUTE_NAME, model_meta)
+
+
+def get_request_model_meta(request: Any) -> Optional[ModelMeta]:
+    """
+    ModelMeta of the controller handling the request, None if not set
+    """
+    model_meta: Optional[ModelMeta] = getattr(
+        request, REQUEST_MODEL_META_ATTRIBUTE_NAME, None
+    )
+    return model_meta
+
 
 class ModelMetaConfig(object):
+    @staticmethod
+    def get_model_meta(obj: Any, model_meta: Optional[ModelMeta] = None) -> ModelMeta:
+        model = obj if isinstance(obj, type) else type(obj)
+        return ModelMetaRegistry.get_model_meta(model, model_meta)
+
+    @staticmethod
+    def get_compiled_meta(obj: Any) -> Optional[ModelMeta]:
+        """
+        ModelMeta of obj, if its configuration was set by ModelOptions.set_model_meta
+        """
+        model_meta: Optional[ModelMeta] = getattr(obj, MODEL_META_ATTRIBUTE_NAME, None)
+        if model_meta and getattr(obj, META_ATTRIBUTE_NAME, None) is model_meta.meta:
+            return model_meta
+        return None
+
     @staticmethod
     def get_configuration(obj: models.Model, _name: str, default: Any = None) -> Any:
         _value = default if default else None
@@ -109,6 +619,10 @@ class ModelMetaConfig(object):
         return sensitive_list
 
     def get_final_excluded_list(self, obj: models.Model) -> List[Any]:
+        model_meta = self.get_compiled_meta(obj)
+        if model_meta:
+            return list(model_meta.excluded_fields)
+
         total_excluded_list = []
         sensitive_list: List = list(SENSITIVE_FIELDS_ATTR_DEFAULT)
         excluded_list = []
@@ -128,6 +642,10 @@ class ModelMetaConfig(object):
         return list(set(total_excluded_list))
 
     def show_field(self, obj: models.Model, field_name: str) -> bool:
+        model_meta = self.get_compiled_meta(obj)
+        if model_meta:
+            return model_meta.show_field(field_name)
+
         model_exclude_list = self.get_model_exclude_list(obj)
         if model_exclude_list:
             if field_name in self.get_final_excluded_list(obj):
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class CrudModel(object):
@@ -12,14 +12,34 @@ class CrudModel(object):
     def crud_add_obj(self, **payload: Dict) -> Any:
         raise NotImplementedError
 
+    @abstractmethod
+    def crud_bulk_add_objs(self, payloads: List[Dict]) -> List[Any]:
+        raise NotImplementedError
+
     @abstractmethod
     def crud_del_obj(self, pk: int) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def crud_bulk_upsert_objs(
+        self, payloads: List[Dict], unique_fields: Sequence[str]
+    ) -> List[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def crud_bulk_del_objs(
+        self, dry_run: bool = False, **filters: Any
+    ) -> Tuple[int, Dict[str, int]]:
+        raise NotImplementedError
+
     @abstractmethod
     def crud_update_obj(self, pk: int, payload: Dict) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def crud_bulk_update_objs(self, payloads: Dict[Any, Dict]) -> List[Any]:
+        raise NotImplementedError
+
     @abstractmethod
     def crud_get_obj(self, pk: int) -> Any:
         raise NotImplementedError
@@ -35,3 +55,59 @@ class CrudModel(object):
     @abstractmethod
     def crud_filter_exclude(self, **kwargs: Any) -> Any:
         raise NotImplementedError
+
+
+class AsyncCrudModel(object):
+    """
+    Async counterpart of CrudModel, awaited by the services
+    """
+
+    @abstractmethod
+    async def acrud_add_obj(self, **payload: Dict) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_bulk_add_objs(self, payloads: List[Dict]) -> List[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_del_obj(self, pk: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_bulk_upsert_objs(
+        self, payloads: List[Dict], unique_fields: Sequence[str]
+    ) -> List[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_bulk_del_objs(
+        self, dry_run: bool = False, **filters: Any
+    ) -> Tuple[int, Dict[str, int]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_update_obj(self, pk: int, payload: Dict) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_bulk_update_objs(self, payloads: Dict[Any, Dict]) -> List[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_get_obj(self, pk: int) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_get_objs_all(
+        self, maximum: Optional[int] = None, **filters: Any
+    ) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_filter(self, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acrud_filter_exclude(self, **kwargs: Any) -> Any:
+        raise NotImplementedError
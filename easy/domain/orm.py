@@ -1,55 +1,208 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from collections import defaultdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
-from django.db import models, transaction
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, router, transaction
+from django.db.models import signals
+from django.db.models.query import ModelIterable
 from ninja_extra.shortcuts import get_object_or_none
 
-from easy.controller.meta_conf import ModelMetaConfig
-from easy.domain.meta import CrudModel
+from easy.cache import has_listeners, invalidate_objects
+from easy.conf import settings as easy_settings
+from easy.controller.meta_conf import (
+    FIELD_KIND_MANY,
+    FIELD_KIND_ONE,
+    ModelMeta,
+    ModelMetaConfig,
+    ModelMetaRegistry,
+    PlanField,
+)
+from easy.domain.meta import AsyncCrudModel, CrudModel
 from easy.exception import BaseAPIException
+from easy.executor import run_in_db_executor
+from easy.renderer.json import EncodedJSON, get_json_backend
+from easy.response import PAGINATION_ATTRIBUTE
+from easy.utils import batched
 
 logger = logging.getLogger(__name__)
 
 
-class DjangoOrmModel(CrudModel):
-    def __init__(self, model: Optional[Type[models.Model]] = None) -> None:
+class DjangoOrmModel(CrudModel, AsyncCrudModel):
+    def __init__(
+        self,
+        model: Optional[Type[models.Model]] = None,
+        model_meta: Optional[ModelMeta] = None,
+    ) -> None:
         self.model = model
+        self._model_meta = model_meta
         if self.model:
-            config = ModelMetaConfig()
-            exclude_list = config.get_final_excluded_list(self.model())
-            self.m2m_fields_list: List = list(
-                _field
-                for _field in self.model._meta.get_fields(include_hidden=True)
-                if (
-                    isinstance(_field, models.ManyToManyField)
-                    and ((_field not in exclude_list) if exclude_list else True)
-                )
-            )
             super().__init__(self.model)
 
+    @property
+    def model_meta(self) -> ModelMeta:
+        """
+        Compiled model metadata, the default one of the model if not given
+        """
+        return ModelMetaRegistry.get_model_meta(self.model, self._model_meta)
+
+    @model_meta.setter
+    def model_meta(self, model_meta: Optional[ModelMeta]) -> None:
+        self._model_meta = model_meta
+
+    @property
+    def m2m_fields_list(self) -> List:
+        return self.model_meta.m2m_fields
+
     def _separate_payload(self, payload: Dict) -> Tuple[Dict, Dict]:
-        m2m_fields = {}
-        local_fields = {}
-        for _field in payload.keys():
-            model_field = self.model._meta.get_field(_field)
-            if model_field in self.m2m_fields_list:
-                m2m_fields.update({_field: payload[_field]})
-            else:
-                # Handling FK fields ( append _id in the end)
-                if self.model._meta.get_field(_field).is_relation:
-                    if not f"{_field}".endswith("_id"):
-                        local_fields.update({f"{_field}_id": payload[_field]})
-                else:
-                    local_fields.update({_field: payload[_field]})
-        return local_fields, m2m_fields
+        """
+        Local fields (FK as attname) and m2m fields of a write payload, routed
+        by the write plan compiled once per model
+        """
+        return self.model_meta.split_payload(payload)
 
-    @staticmethod
-    def _crud_set_m2m_obj(obj: models.Model, m2m_fields: Dict) -> None:
+    def _crud_set_m2m_obj(
+        self, obj: models.Model, m2m_fields: Dict, created: bool = False
+    ) -> None:
         if obj and m2m_fields:
+            self._crud_write_m2m({obj.pk: m2m_fields}, created=created)
+
+    def _m2m_through(self, _field: str) -> Tuple[Any, str, str]:
+        """
+        Through model of a m2m field, with its source and target FK columns
+        """
+        model_field: Any = self.model._meta.get_field(_field)
+        through = model_field.remote_field.through
+        source = through._meta.get_field(model_field.m2m_field_name()).attname
+        target = through._meta.get_field(model_field.m2m_reverse_field_name()).attname
+        return through, source, target
+
+    def _m2m_symmetrical(self, _field: str) -> bool:
+        """
+        Whether the m2m field links the model to itself both ways, each link
+        held by a row per direction
+        """
+        model_field: Any = self.model._meta.get_field(_field)
+        return bool(
+            model_field.remote_field.symmetrical
+            and model_field.related_model == self.model
+        )
+
+    def _crud_write_m2m(
+        self, m2m_payloads: Dict[Any, Dict], created: bool = False
+    ) -> None:
+        """
+        Write the m2m links of objects, {pk: {m2m field: ids}}, the ids given
+        replace the current ones. Per through table: one select of the current
+        links of all the objects (none for just created objects), one filtered
+        delete of the removed links, one bulk_create(ignore_conflicts=True) of
+        the added ones, along with their mirrored links for a symmetrical m2m
+        to the model itself. m2m_changed is sent, as by set(), unless the
+        APIMeta m2m_signals option is off, or nothing listens to it.
+        """
+        batch_size = easy_settings.EASY_API_BULK_BATCH_SIZE
+        if not created:
+            invalidate_objects(self.model, m2m_payloads)
+        wanted: Dict[str, Dict[Any, Dict[Any, None]]] = defaultdict(dict)
+        for pk, m2m_fields in m2m_payloads.items():
             for _field, _value in m2m_fields.items():
-                if _value and isinstance(_value, List):
-                    m2m_f = getattr(obj, _field)
-                    m2m_f.set(_value)
+                if isinstance(_value, List):
+                    wanted[_field][pk] = dict.fromkeys(_value)
+        instances: Optional[Dict[Any, models.Model]] = None
+        for _field, links in wanted.items():
+            through, source, target = self._m2m_through(_field)
+            current: Dict[Any, Dict[Any, Any]] = defaultdict(dict)
+            if not created:
+                for link_pk, pk, value in through.objects.filter(
+                    **{f"{source}__in": list(links)}
+                ).values_list("pk", source, target):
+                    current[pk][value] = link_pk
+            removed = {
+                pk: [value for value in current[pk] if value not in values]
+                for pk, values in links.items()
+            }
+            added = {
+                pk: [value for value in values if value not in current[pk]]
+                for pk, values in links.items()
+            }
+            invalidate_objects(
+                self.model._meta.get_field(_field).related_model,
+                {value for values in removed.values() for value in values}
+                | {value for values in added.values() for value in values},
+            )
+            send = self.model_meta.model_opts.m2m_signals and has_listeners(
+                signals.m2m_changed, through
+            )
+            if send and instances is None:
+                instances = self.model.objects.in_bulk(list(m2m_payloads))
+            if send:
+                self._send_m2m_changed(_field, "pre_remove", removed, instances)
+            symmetrical = self._m2m_symmetrical(_field)
+            stale = models.Q(
+                pk__in=[
+                    current[pk][value]
+                    for pk, values in removed.items()
+                    for value in values
+                ]
+            )
+            if symmetrical:
+                for pk, values in removed.items():
+                    for value in values:
+                        stale |= models.Q(**{source: value, target: pk})
+            if any(removed.values()):
+                through.objects.filter(stale).delete()
+            if send:
+                self._send_m2m_changed(_field, "post_remove", removed, instances)
+                self._send_m2m_changed(_field, "pre_add", added, instances)
+            through.objects.bulk_create(
+                [
+                    through(**{source: pk, target: value})
+                    for pk, values in added.items()
+                    for value in values
+                ]
+                + [
+                    through(**{source: value, target: pk})
+                    for pk, values in added.items()
+                    for value in values
+                    if symmetrical and value != pk
+                ],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            if send:
+                self._send_m2m_changed(_field, "post_add", added, instances)
+
+    def _send_m2m_changed(
+        self,
+        _field: str,
+        action: str,
+        changes: Dict[Any, List[Any]],
+        instances: Optional[Dict[Any, models.Model]],
+    ) -> None:
+        model_field: Any = self.model._meta.get_field(_field)
+        for pk, values in changes.items():
+            if values and instances and pk in instances:
+                signals.m2m_changed.send(
+                    sender=model_field.remote_field.through,
+                    instance=instances[pk],
+                    action=action,
+                    reverse=False,
+                    model=model_field.related_model,
+                    pk_set=set(values),
+                    using=instances[pk]._state.db,
+                )
 
     # Define BASE CRUD
     @transaction.atomic()
@@ -60,12 +213,183 @@ class DjangoOrmModel(CrudModel):
             # Create obj with local_fields payload
             obj = self.model.objects.create(**local_f_payload)
             # Save obj with m2m_fields payload
-            self._crud_set_m2m_obj(obj, m2m_f_payload)
+            self._crud_set_m2m_obj(obj, m2m_f_payload, created=True)
         except Exception as e:  # pragma: no cover
             raise BaseAPIException(f"Create Error - {e}")
         if obj:
             return obj.id
 
+    @transaction.atomic()
+    def crud_bulk_add_objs(self, payloads: List[Dict]) -> List[Any]:
+        """
+        Create objects with bulk_create, in batches of EASY_API_BULK_BATCH_SIZE,
+        and their m2m links with one bulk_create per through table.
+        Backends not returning the new pks from bulk inserts save them one by one.
+        """
+        batch_size = easy_settings.EASY_API_BULK_BATCH_SIZE
+        objs, m2m_payloads = [], []
+        for payload in payloads:
+            local_f_payload, m2m_f_payload = self._separate_payload(payload)
+            objs.append(self.model(**local_f_payload))
+            m2m_payloads.append(m2m_f_payload)
+        db = router.db_for_write(self.model)
+        try:
+            if connections[db].features.can_return_rows_from_bulk_insert:
+                self.model.objects.bulk_create(objs, batch_size=batch_size)
+            else:  # pragma: no cover
+                for obj in objs:
+                    obj.save()
+            self._crud_write_m2m(
+                {
+                    obj.pk: m2m_f_payload
+                    for obj, m2m_f_payload in zip(objs, m2m_payloads)
+                    if m2m_f_payload
+                },
+                created=True,
+            )
+        except Exception as e:  # pragma: no cover
+            raise BaseAPIException(f"Create Error - {e}")
+        invalidate_objects(self.model, [obj.pk for obj in objs])
+        return [obj.pk for obj in objs]
+
+    def get_unique_fields(self, unique_fields: Sequence[str]) -> List[Any]:
+        """
+        Model fields of unique_fields, which must be unique together
+        (unique field, unique_together, or unconditional UniqueConstraint)
+        """
+        opts = self.model._meta
+        fields = []
+        for name in unique_fields:
+            try:
+                fields.append(opts.get_field(name))
+            except FieldDoesNotExist:
+                raise ValueError(f"Unknown field: {name}")
+        unique_sets = [
+            {_field.name} for _field in opts.concrete_fields if _field.unique
+        ]
+        unique_sets.extend(set(together) for together in opts.unique_together)
+        unique_sets.extend(
+            set(constraint.fields)
+            for constraint in opts.total_unique_constraints
+            if constraint.fields
+        )
+        if {_field.name for _field in fields} not in unique_sets:
+            raise ValueError(
+                f"Fields are not unique together: {', '.join(unique_fields)}"
+            )
+        return fields
+
+    @transaction.atomic()
+    def crud_bulk_upsert_objs(
+        self, payloads: List[Dict], unique_fields: Sequence[str]
+    ) -> List[Any]:
+        """
+        Create objects, or update the ones matching them on unique_fields, with
+        bulk_create(update_conflicts=True) in batches of EASY_API_BULK_BATCH_SIZE,
+        or, on backends not supporting it, a select of the existing objects then
+        bulk_create/bulk_update, batch by batch. Existing objects only get the
+        fields their payload holds, objects are written in groups of payloads
+        holding the same fields; payloads of unique fields only take the
+        select path too, to get the pks of existing objects. The pks not
+        returned by bulk_create (before Django 5.0, or without RETURNING) are
+        selected by unique_fields. m2m links are replaced.
+        """
+        batch_size = easy_settings.EASY_API_BULK_BATCH_SIZE
+        fields = self.get_unique_fields(unique_fields)
+        keys = {_field.attname for _field in fields} | {self.model._meta.pk.attname}
+        # auto_now fields are set by bulk_create, and written on conflicts too
+        auto_now = tuple(_field.attname for _field in self.model_meta.auto_now_fields)
+        objs, m2m_payloads = [], []
+        groups: Dict[Tuple[str, ...], List[models.Model]] = defaultdict(list)
+        for payload in payloads:
+            local_f_payload, m2m_f_payload = self._separate_payload(payload)
+            obj = self.model(**local_f_payload)
+            objs.append(obj)
+            m2m_payloads.append(m2m_f_payload)
+            columns = set(local_f_payload) - keys
+            if columns:
+                columns.update(auto_now)
+            groups[tuple(sorted(columns))].append(obj)
+        db = router.db_for_write(self.model)
+        try:
+            native = connections[db].features.supports_update_conflicts_with_target
+            for update_fields, group in groups.items():
+                if native and update_fields:
+                    self.model.objects.bulk_create(
+                        group,
+                        batch_size=batch_size,
+                        update_conflicts=True,
+                        unique_fields=[_field.name for _field in fields],
+                        update_fields=list(update_fields),
+                    )
+                    missing = [obj for obj in group if obj.pk is None]
+                    for batch in batched(missing, batch_size):
+                        existing = self._crud_select_pks(list(batch), fields)
+                        for obj in batch:
+                            obj.pk = existing.get(self._unique_key(obj, fields))
+                else:
+                    for batch in batched(group, batch_size):
+                        self._crud_upsert_batch(
+                            list(batch), fields, list(update_fields)
+                        )
+            self._crud_write_m2m(
+                {
+                    obj.pk: m2m_f_payload
+                    for obj, m2m_f_payload in zip(objs, m2m_payloads)
+                    if m2m_f_payload
+                }
+            )
+        except Exception as e:  # pragma: no cover
+            raise BaseAPIException(f"Upsert Error - {e}")
+        invalidate_objects(self.model, [obj.pk for obj in objs])
+        return [obj.pk for obj in objs]
+
+    def _crud_upsert_batch(
+        self, objs: List[models.Model], fields: List[Any], update_fields: List[str]
+    ) -> None:
+        """
+        Upsert fallback: select the existing objects of the batch by their
+        unique fields, then bulk_update them and bulk_create the new ones
+        """
+        existing = self._crud_select_pks(objs, fields)
+        created: List[models.Model] = []
+        updated: List[models.Model] = []
+        for obj in objs:
+            obj.pk = existing.get(self._unique_key(obj, fields))
+            (updated if obj.pk is not None else created).append(obj)
+        if updated and update_fields:
+            for obj in updated:
+                for _field in self.model_meta.auto_now_fields:
+                    _field.pre_save(obj, False)
+            self.model.objects.bulk_update(updated, update_fields)
+        db = router.db_for_write(self.model)
+        if connections[db].features.can_return_rows_from_bulk_insert:
+            self.model.objects.bulk_create(created)
+        else:
+            for obj in created:
+                obj.save(force_insert=True)
+
+    @staticmethod
+    def _unique_key(obj: models.Model, fields: List[Any]) -> Tuple:
+        return tuple(getattr(obj, _field.attname) for _field in fields)
+
+    def _crud_select_pks(
+        self, objs: List[models.Model], fields: List[Any]
+    ) -> Dict[Tuple, Any]:
+        """
+        pks of the existing objects matching objs on their unique fields
+        """
+        attnames = [_field.attname for _field in fields]
+        lookup = models.Q()
+        for obj in objs:
+            lookup |= models.Q(
+                **{attname: getattr(obj, attname) for attname in attnames}
+            )
+        return {
+            tuple(row[1:]): row[0]
+            for row in self.model.objects.filter(lookup).values_list("pk", *attnames)
+        }
+
     def crud_del_obj(self, pk: int) -> bool:
         obj = get_object_or_none(self.model, pk=pk)
         if obj:
@@ -74,54 +398,249 @@ class DjangoOrmModel(CrudModel):
         else:
             return False
 
+    @transaction.atomic()
+    def crud_bulk_del_objs(
+        self, dry_run: bool = False, **filters: Any
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Delete the objects matching filters with a single QuerySet.delete(),
+        refused past EASY_API_BULK_DELETE_MAXIMUM objects (ValueError), bad
+        filters raise FieldError, ValidationError, TypeError or ValueError
+        Returns: count of the objects matching, and deleted counts per model
+        (cascades included) from Django's delete collector, empty on dry_run
+        """
+        qs = self.model.objects.filter(**filters)
+        maximum = easy_settings.EASY_API_BULK_DELETE_MAXIMUM
+        if dry_run or maximum:
+            count = qs.count()
+            if maximum and count > maximum:
+                raise ValueError(
+                    f"{count} objects matched, over the maximum of {maximum}."
+                )
+            if dry_run:
+                return count, {}
+        _, deleted = qs.delete()
+        return deleted.get(self.model._meta.label, 0), deleted
+
     @transaction.atomic()
     def crud_update_obj(self, pk: int, payload: Dict) -> bool:
+        """
+        Write only the payload fields, in a single UPDATE ... WHERE pk=, that
+        skips a row already holding the values, a missing row is told apart
+        from a no-op by an exists() only when nothing was updated. auto_now
+        fields are written along, on every PATCH, as save() does.
+        With save() signal receivers connected for the model, fields with a
+        pre_save of their own, or save() overridden by the model, the object is
+        loaded and saved with update_fields, the fields actually changed (plus
+        the pre_save ones).
+        """
         local_fields, m2m_fields = self._separate_payload(payload)
-        if not self.model.objects.filter(pk=pk).exists():
-            return False
+        auto_now = self.model_meta.auto_now_fields
         try:
-            obj, _ = self.model.objects.update_or_create(pk=pk, defaults=local_fields)
+            if (
+                self._has_save_receivers()
+                or self.model_meta.custom_pre_save_fields
+                or self.model_meta.custom_save
+            ):
+                obj = self.model.objects.filter(pk=pk).first()
+                if obj is None:
+                    return False
+                self._crud_save_changed(obj, local_fields)
+            else:
+                qs = self.model.objects.filter(pk=pk)
+                if auto_now:
+                    obj = self.model(pk=pk)
+                    updated = qs.update(
+                        **local_fields,
+                        **{
+                            _field.attname: _field.pre_save(obj, False)
+                            for _field in auto_now
+                            if _field.attname not in local_fields
+                        },
+                    )
+                else:
+                    updated = local_fields and qs.exclude(**local_fields).update(
+                        **local_fields
+                    )
+                if not updated and not qs.exists():
+                    return False
+                obj = self.model(pk=pk)
+                invalidate_objects(self.model, [pk])
             self._crud_set_m2m_obj(obj, m2m_fields)
         except Exception as e:  # pragma: no cover
             raise BaseAPIException(f"Update Error - {e}")
-        return bool(obj)
+        return True
 
-    def crud_get_obj(self, pk: int) -> Any:
-        if self.m2m_fields_list:
-            qs = self.model.objects.filter(pk=pk).prefetch_related(
-                self.m2m_fields_list[0].name
+    def _has_save_receivers(self) -> bool:
+        return has_listeners(signals.pre_save, self.model) or has_listeners(
+            signals.post_save, self.model
+        )
+
+    def _crud_save_changed(self, obj: models.Model, local_fields: Dict) -> None:
+        """
+        Save the fields whose value differs, along with the fields set by
+        pre_save (auto_now, custom), nothing if there are none
+        """
+        changed = []
+        for attname, value in local_fields.items():
+            model_field: Any = self.model._meta.get_field(attname)
+            value = model_field.to_python(value)
+            if getattr(obj, model_field.attname) != value:
+                setattr(obj, model_field.attname, value)
+                changed.append(model_field.attname)
+        changed.extend(
+            _field.attname
+            for _field in self.get_pre_save_fields()
+            if _field.attname not in changed
+        )
+        if changed:
+            obj.save(update_fields=changed)
+
+    def get_pre_save_fields(self) -> Tuple[Any, ...]:
+        return self.model_meta.auto_now_fields + self.model_meta.custom_pre_save_fields
+
+    @transaction.atomic()
+    def crud_bulk_update_objs(self, payloads: Dict[Any, Dict]) -> List[Any]:
+        """
+        Update objects, {pk: changes}, the objects are grouped by the set of
+        columns changed, and each group written with bulk_update, in batches of
+        EASY_API_BULK_BATCH_SIZE, m2m links are replaced by through table diffs.
+        Fields set by pre_save (auto_now, custom) are written along, the objects
+        are then loaded if any pre_save is custom (it may read other fields).
+        Neither save() nor m2m_changed signals are sent.
+        Returns: pks of the objects found, and updated
+        """
+        batch_size = easy_settings.EASY_API_BULK_BATCH_SIZE
+        pre_save = self.get_pre_save_fields()
+        instances: Dict[Any, models.Model] = {}
+        if self.model_meta.custom_pre_save_fields:
+            instances = self.model.objects.in_bulk(list(payloads))
+            pks = list(instances)
+        else:
+            pks = list(
+                self.model.objects.filter(pk__in=list(payloads)).values_list(
+                    "pk", flat=True
+                )
             )
-            for f in self.m2m_fields_list[1:]:
-                qs = qs.prefetch_related(f.name)
+        groups: Dict[FrozenSet[str], List[models.Model]] = defaultdict(list)
+        m2m_payloads = {}
+        for pk in pks:
+            local_fields, m2m_fields = self._separate_payload(payloads[pk])
+            if local_fields or pre_save:
+                obj = instances.get(pk) or self.model(pk=pk)
+                for attname, value in local_fields.items():
+                    setattr(obj, attname, value)
+                for _field in pre_save:
+                    setattr(obj, _field.attname, _field.pre_save(obj, False))
+                attnames = set(local_fields) | {f.attname for f in pre_save}
+                groups[frozenset(attnames)].append(obj)
+            if m2m_fields:
+                m2m_payloads[pk] = m2m_fields
+        try:
+            for columns, objs in groups.items():
+                self.model.objects.bulk_update(
+                    objs, sorted(columns), batch_size=batch_size
+                )
+            self._crud_write_m2m(m2m_payloads)
+        except Exception as e:  # pragma: no cover
+            raise BaseAPIException(f"Update Error - {e}")
+        invalidate_objects(self.model, pks)
+        return pks
+
+    def get_queryset(self, fieldset: Optional[FrozenSet[str]] = None) -> Any:
+        """
+        Lazy base queryset of the read path, with the one relationships read when
+        serializing joined in (select_related), and m2m fields prefetched.
+        Columns never serialized are deferred, a sparse fieldset narrows the
+        columns (only()), joins and prefetches.
+        """
+        qs: models.QuerySet = self.model.objects.all()
+        select_related = self.model_meta.get_select_related(
+            easy_settings.EASY_API_SELECT_RELATED_DEPTH
+        )
+        prefetch: List[Any] = [f.name for f in self.m2m_fields_list]
+        prefetch.extend(self.get_reverse_prefetches())
+        if fieldset is None:
+            if self.model_meta.deferred_fields:
+                qs = qs.defer(*self.model_meta.deferred_fields)
         else:
-            qs = self.model.objects.filter(pk=pk)
-        if qs:
-            return qs.first()
+            qs = qs.only(*self.get_fieldset_columns(fieldset))
+            select_related = [
+                lookup
+                for lookup in select_related
+                if lookup.split("__", 1)[0] in fieldset
+            ]
+            prefetch = [
+                lookup
+                for lookup in prefetch
+                if getattr(lookup, "prefetch_through", lookup) in fieldset
+            ]
+        if select_related:
+            qs = qs.select_related(*select_related)
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+        return qs
+
+    def get_fieldset_columns(self, fieldset: FrozenSet[str]) -> List[str]:
+        """
+        Concrete fields (the pk always) to be loaded for a sparse fieldset
+        """
+        columns = [self.model._meta.pk.name]
+        for name, _, _field in self.model_meta.serialization_plan:
+            if name in fieldset and _field.concrete and not _field.many_to_many:
+                columns.append(name)
+        return columns
+
+    def get_reverse_prefetches(self) -> List[models.Prefetch]:
+        """
+        Prefetch of the reverse relations listed in model_reverse_relations,
+        only the pk (and the FK back to the parent) is read without model_join
+        """
+        prefetches = []
+        for rel in self.model_meta.reverse_many_fields:
+            accessor: Any = rel.get_accessor_name()
+            if self.model_meta.model_opts.model_join:
+                prefetches.append(models.Prefetch(accessor))
+                continue
+            related_model: Any = rel.related_model
+            only = [related_model._meta.pk.name]
+            if isinstance(rel, models.ManyToOneRel):
+                only.append(rel.field.name)
+            prefetches.append(
+                models.Prefetch(
+                    accessor, queryset=related_model._default_manager.only(*only)
+                )
+            )
+        return prefetches
 
-    def crud_get_objs_all(self, maximum: Optional[int] = None, **filters: Any) -> Any:
+    def crud_get_obj(self, pk: int, fieldset: Optional[FrozenSet[str]] = None) -> Any:
+        return self.get_queryset(fieldset).filter(pk=pk).first()
+
+    def crud_get_objs_all(
+        self,
+        maximum: Optional[int] = None,
+        fieldset: Optional[FrozenSet[str]] = None,
+        **filters: Any,
+    ) -> Any:
         """
         CRUD: get multiple objects, with django orm filters support
+        The queryset stays lazy, so that it is only evaluated once paginated
         Args:
             maximum: {int}
+            fieldset: sparse fieldset, see ModelMeta.get_fieldset
             filters: {"field_name__lte", 1}
         Returns: qs
 
         """
-        qs = None
+        qs = self.get_queryset(fieldset)
         if filters:
             try:
-                qs = self.model.objects.filter(**filters)
+                return qs.filter(**filters)
             except Exception as e:  # pragma: no cover
                 logger.error(e)
-        elif maximum:
-            qs = self.model.objects.all()[:maximum]
-        else:
-            qs = self.model.objects.all()
-        # If there are 2m2_fields
-        if self.m2m_fields_list and qs:
-            qs = qs.prefetch_related(self.m2m_fields_list[0].name)
-            for f in self.m2m_fields_list[1:]:
-                qs = qs.prefetch_related(f.name)
+                return None
+        if maximum:
+            return qs[:maximum]
         return qs
 
     def crud_filter(self, **kwargs: Any) -> Any:
@@ -130,6 +649,77 @@ class DjangoOrmModel(CrudModel):
     def crud_filter_exclude(self, **kwargs: Any) -> Any:
         return self.model.objects.all().exclude(**kwargs)
 
+    # Define BASE async CRUD, DB work runs in a single hop to the DB executor.
+    # Lazy querysets are returned without any thread hop, updates, and writes
+    # touching m2m fields run in a single (transactional) hop to the sync methods.
+    async def acrud_add_obj(self, **payload: Dict) -> Any:
+        local_f_payload, m2m_f_payload = self._separate_payload(payload)
+        if m2m_f_payload:
+            return await run_in_db_executor(self.crud_add_obj, **payload)
+        try:
+            obj = await run_in_db_executor(self.model.objects.create, **local_f_payload)
+        except Exception as e:  # pragma: no cover
+            raise BaseAPIException(f"Create Error - {e}")
+        if obj:
+            return obj.id
+
+    async def acrud_bulk_add_objs(self, payloads: List[Dict]) -> List[Any]:
+        return await run_in_db_executor(self.crud_bulk_add_objs, payloads)
+
+    async def acrud_bulk_del_objs(
+        self, dry_run: bool = False, **filters: Any
+    ) -> Tuple[int, Dict[str, int]]:
+        return await run_in_db_executor(
+            self.crud_bulk_del_objs, dry_run=dry_run, **filters
+        )
+
+    async def acrud_bulk_upsert_objs(
+        self, payloads: List[Dict], unique_fields: Sequence[str]
+    ) -> List[Any]:
+        return await run_in_db_executor(
+            self.crud_bulk_upsert_objs, payloads, unique_fields
+        )
+
+    async def acrud_del_obj(self, pk: int) -> bool:
+        deleted, _ = await run_in_db_executor(self.model.objects.filter(pk=pk).delete)
+        return bool(deleted)
+
+    async def acrud_update_obj(self, pk: int, payload: Dict) -> bool:
+        return await run_in_db_executor(self.crud_update_obj, pk, payload)
+
+    async def acrud_bulk_update_objs(self, payloads: Dict[Any, Dict]) -> List[Any]:
+        return await run_in_db_executor(self.crud_bulk_update_objs, payloads)
+
+    async def acrud_get_obj(
+        self, pk: int, fieldset: Optional[FrozenSet[str]] = None
+    ) -> Any:
+        return await run_in_db_executor(self.get_queryset(fieldset).filter(pk=pk).first)
+
+    def crud_get_obj_encoded(
+        self, pk: int, fieldset: Optional[FrozenSet[str]] = None
+    ) -> Optional[EncodedJSON]:
+        """
+        CRUD: get a single object, serialized and encoded, None if not found
+        """
+        obj = self.crud_get_obj(pk, fieldset=fieldset)
+        if obj is None:
+            return None
+        return django_serializer.serialize_data_encoded(obj, self.model_meta)
+
+    async def acrud_get_objs_all(
+        self,
+        maximum: Optional[int] = None,
+        fieldset: Optional[FrozenSet[str]] = None,
+        **filters: Any,
+    ) -> Any:
+        return self.crud_get_objs_all(maximum, fieldset=fieldset, **filters)
+
+    async def acrud_filter(self, **kwargs: Any) -> Any:
+        return self.crud_filter(**kwargs)  # pragma: no cover
+
+    async def acrud_filter_exclude(self, **kwargs: Any) -> Any:
+        return self.crud_filter_exclude(**kwargs)
+
 
 class DjangoSerializer(ModelMetaConfig):
     @staticmethod
@@ -161,41 +751,298 @@ class DjangoSerializer(ModelMetaConfig):
         items = data.get("items", None)
         # ninja-extra < 0.31 paginated to a QuerySet under "items"; 0.31+ returns
         # a plain list under {"count": int, "items": [...]}.
-        if isinstance(items, models.query.QuerySet):
+        if isinstance(items, (models.query.QuerySet, EncodedJSON)):
             return True
         return "count" in data and isinstance(items, list)
 
+    def get_pagination(self, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Pagination state of paginated data, returned alongside the items
+        """
+        if not self.is_paginated(data):
+            return None
+        pagination: Optional[Dict[str, Any]] = data.get(PAGINATION_ATTRIBUTE)
+        return pagination
+
     def serialize_model_instance(
-        self, obj: models.Model, referrers: Any = tuple()
+        self,
+        obj: models.Model,
+        referrers: Any = tuple(),
+        plan: Optional[Tuple[PlanField, ...]] = None,
+        model_meta: Optional[ModelMeta] = None,
     ) -> Dict[Any, Any]:
-        """Serializes Django model instance to dictionary"""
-        out = {}
-        for field in obj._meta.get_fields():
-            if self.show_field(obj, field.name):
-                if self.is_one_relationship(field):
-                    out.update(
-                        self.serialize_foreign_key(obj, field, referrers + (obj,))
+        """
+        Serializes Django model instance to dictionary, with model_meta (e.g.
+        the one of the controller), the default one of the model if not given
+        """
+        out: Dict[Any, Any] = {}
+        model_meta = self.get_model_meta(obj, model_meta)
+        if plan is None:
+            plan = model_meta.serialization_plan
+        for name, kind, field in plan:
+            if kind == FIELD_KIND_ONE:
+                out.update(
+                    self.serialize_foreign_key(
+                        obj, field, referrers + (obj,), model_meta
                     )
-
-                elif self.is_many_relationship(field):
-                    out.update(
-                        self.serialize_many_relationship(obj, referrers + (obj,))
+                )
+            elif kind == FIELD_KIND_MANY:
+                out.update(
+                    self.serialize_many_relationship(
+                        obj, referrers + (obj,), model_meta
                     )
-
-                else:
-                    out.update(self.serialize_value_field(obj, field))
+                )
+            else:
+                out[name] = getattr(obj, name)
         return out
 
     def serialize_queryset(
-        self, data: models.query.QuerySet, referrers: Tuple[Any, ...] = tuple()
+        self,
+        data: models.query.QuerySet,
+        referrers: Tuple[Any, ...] = tuple(),
+        model_meta: Optional[ModelMeta] = None,
     ) -> List[Dict[Any, Any]]:
         """Serializes Django Queryset to dictionary"""
-        return [self.serialize_model_instance(obj, referrers) for obj in data]
+        if not referrers and self.is_values_serializable(data, model_meta):
+            return self.serialize_queryset_values(data, model_meta)
+        plan = self.get_queryset_plan(data, model_meta)
+        return [
+            self.serialize_model_instance(obj, referrers, plan, model_meta)
+            for obj in data
+        ]
+
+    def get_queryset_plan(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> Optional[Tuple[PlanField, ...]]:
+        """
+        Serialization plan narrowed to the fields loaded by a queryset with
+        only()/defer(), None if every serialized field is loaded
+        """
+        if not self.is_queryset(data):
+            return None
+        names, defer = data.query.deferred_loading
+        if not names:
+            return None
+        model_meta = self.get_model_meta(data.model, model_meta)
+        if defer:
+            if all(name in model_meta.deferred_fields for name in names):
+                return None
+            loaded = frozenset(
+                f.name for f in model_meta.serialization_plan if f.name not in names
+            )
+        else:
+            loaded = frozenset(names)
+            if isinstance(data.query.select_related, dict):
+                loaded = loaded.union(data.query.select_related)
+        return model_meta.get_loaded_plan(loaded)
+
+    def get_instance_plan(
+        self, obj: models.Model, model_meta: Optional[ModelMeta] = None
+    ) -> Optional[Tuple[PlanField, ...]]:
+        """
+        Serialization plan narrowed to the fields loaded on an instance,
+        None if every serialized field is loaded
+        """
+        deferred = obj.get_deferred_fields()
+        if not deferred:
+            return None
+        model_meta = self.get_model_meta(obj, model_meta)
+        if deferred.isdisjoint(model_meta.plan_attnames):
+            return None
+        loaded = frozenset(
+            name
+            for name, kind, field in model_meta.serialization_plan
+            if kind != FIELD_KIND_MANY
+            and (
+                field.is_cached(obj)
+                if isinstance(field, models.OneToOneRel)
+                else getattr(field, "attname", name) not in deferred
+            )
+        )
+        return model_meta.get_loaded_plan(loaded)
+
+    def is_values_serializable(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> bool:
+        """
+        Flat (no model_recursive/model_join), not yet evaluated model queryset,
+        which can be serialized from a values() projection
+        """
+        if not self.is_queryset(data) or data._result_cache is not None:
+            return False
+        if data._iterable_class is not ModelIterable:
+            return False
+        query = data.query
+        if query.annotations or query.combinator or query.extra_select:
+            return False
+        model_meta = self.get_model_meta(data.model, model_meta)
+        if model_meta.model_opts.model_recursive or model_meta.model_opts.model_join:
+            return False
+        if model_meta.values_plan is None:
+            return False
+        m2m_names = {f.name for f in model_meta.m2m_fields}
+        return all(lookup in m2m_names for lookup in data._prefetch_related_lookups)
+
+    def serialize_queryset_values(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> List[Dict[Any, Any]]:
+        """
+        Serializes Django Queryset from a values() projection of the visible
+        columns, prefetched m2m ids are gathered with one query per through table
+        """
+        values_qs, m2m_fields = self.get_values_queryset(data, model_meta)
+        return self.serialize_values_rows(data, list(values_qs), m2m_fields, model_meta)
+
+    def get_values_queryset(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> Tuple[Any, List[Any]]:
+        """
+        values() projection of the visible columns, and the prefetched m2m fields
+        """
+        values_plan = self.get_values_plan(data, model_meta)
+        m2m_fields = []
+        if any(f.kind == FIELD_KIND_MANY for f in values_plan):
+            m2m_fields = [
+                data.model._meta.get_field(lookup)
+                for lookup in data._prefetch_related_lookups
+            ]
+        lookups = dict.fromkeys(
+            [data.model._meta.pk.attname]
+            + [f.lookup for f in values_plan if f.kind != FIELD_KIND_MANY]
+        )
+        return data.prefetch_related(None).values(*lookups), m2m_fields
+
+    def get_values_plan(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> Tuple[Any, ...]:
+        """
+        values_plan of the queryset model, narrowed to the loaded fields
+        """
+        values_plan = self.get_model_meta(data.model, model_meta).values_plan or ()
+        plan = self.get_queryset_plan(data, model_meta)
+        if plan is None:
+            return values_plan
+        names = {f.name for f in plan}
+        return tuple(f for f in values_plan if f.name in names)
+
+    def serialize_values_rows(
+        self,
+        data: Any,
+        rows: List[Dict],
+        m2m_fields: List[Any],
+        model_meta: Optional[ModelMeta] = None,
+    ) -> List[Dict[Any, Any]]:
+        """
+        Serializes values() rows of the queryset (data) to dictionaries
+        """
+        values_plan = self.get_values_plan(data, model_meta)
+        model = data.model
+        pk_attname = model._meta.pk.attname
+        m2m_values = self.get_m2m_values(m2m_fields, [row[pk_attname] for row in rows])
+
+        out = []
+        for row in rows:
+            item = {}
+            for name, kind, lookup, converter in values_plan:
+                if kind == FIELD_KIND_MANY:
+                    for m2m_name, ids in m2m_values.items():
+                        item[m2m_name] = ids.get(row[pk_attname], [])
+                elif converter:
+                    item[name] = converter(row[lookup])
+                else:
+                    item[name] = row[lookup]
+            out.append(item)
+        return out
+
+    def serialize_queryset_chunks(
+        self, data: Any, chunk_size: int, model_meta: Optional[ModelMeta] = None
+    ) -> Iterator[List[Dict[Any, Any]]]:
+        """
+        Serializes Django Queryset chunk by chunk, rows are read with
+        QuerySet.iterator(), so that memory use does not depend on the row count
+        """
+        plan = self.get_queryset_plan(data, model_meta)
+        if data._result_cache is not None:
+            for objs in batched(data, chunk_size):
+                yield [
+                    self.serialize_model_instance(obj, plan=plan, model_meta=model_meta)
+                    for obj in objs
+                ]
+        elif self.is_values_serializable(data, model_meta):
+            values_qs, m2m_fields = self.get_values_queryset(data, model_meta)
+            for rows in batched(values_qs.iterator(chunk_size=chunk_size), chunk_size):
+                yield self.serialize_values_rows(data, rows, m2m_fields, model_meta)
+        else:
+            for objs in batched(data.iterator(chunk_size=chunk_size), chunk_size):
+                yield [
+                    self.serialize_model_instance(obj, plan=plan, model_meta=model_meta)
+                    for obj in objs
+                ]
+
+    async def aserialize_queryset_chunks(
+        self, data: Any, chunk_size: int, model_meta: Optional[ModelMeta] = None
+    ) -> AsyncIterator[List[Dict[Any, Any]]]:
+        """
+        serialize_queryset_chunks for async consumers, each chunk is fetched and
+        serialized in the (thread sensitive) sync thread, not the DB executor:
+        the server side cursor of the iterator stays on one thread's connection
+        """
+        chunks = self.serialize_queryset_chunks(data, chunk_size, model_meta)
+
+        def next_chunk() -> Optional[List[Dict[Any, Any]]]:
+            return next(chunks, None)
+
+        while True:
+            chunk = await sync_to_async(next_chunk)()
+            if chunk is None:
+                break
+            yield chunk
+
+    @staticmethod
+    def get_m2m_values(
+        m2m_fields: Sequence[Any], pks: List[Any]
+    ) -> Dict[str, Dict[Any, List[Any]]]:
+        """
+        Related ids of each m2m field, grouped by the pk of the source object
+        """
+        out: Dict[str, Dict[Any, List[Any]]] = {}
+        for m2m_field in m2m_fields:
+            through: Any = m2m_field.remote_field.through
+            source: Any = through._meta.get_field(m2m_field.m2m_field_name())
+            target: Any = through._meta.get_field(m2m_field.m2m_reverse_field_name())
+            ordering = []
+            for order in m2m_field.related_model._meta.ordering:
+                if isinstance(order, str):
+                    desc = "-" if order.startswith("-") else ""
+                    ordering.append(f"{desc}{target.name}__{order.lstrip('-')}")
+            ordering.append(through._meta.pk.name)
+
+            ids: Dict[Any, List[Any]] = defaultdict(list)
+            if pks:
+                rows = (
+                    through._default_manager.filter(**{f"{source.attname}__in": pks})
+                    .order_by(*ordering)
+                    .values_list(source.attname, target.attname)
+                )
+                for source_id, target_id in rows:
+                    ids[source_id].append(target_id)
+            out[m2m_field.name] = ids
+        return out
 
     def serialize_foreign_key(
-        self, obj: models.Model, field: Any, referrers: Any = tuple()
+        self,
+        obj: models.Model,
+        field: Any,
+        referrers: Any = tuple(),
+        model_meta: Optional[ModelMeta] = None,
     ) -> Dict[Any, Any]:
         """Serializes foreign key field of Django model instance"""
+        model_meta = self.get_model_meta(obj, model_meta)
+        if not model_meta.model_opts.model_recursive and isinstance(
+            field, models.ForeignKey
+        ):
+            # Only the id, read from the column, the related row is not joined
+            return {field.name: getattr(obj, field.attname)}
         try:
             if not hasattr(obj, field.name):
                 return {field.name: None}  # pragma: no cover
@@ -209,14 +1056,17 @@ class DjangoSerializer(ModelMetaConfig):
             logger.error(f"serialize_foreign_key error - {obj}", exc_info=exc)
             return {field.name: None}
 
-        if self.get_model_recursive(obj):
+        if model_meta.model_opts.model_recursive:
             return {
                 field.name: self.serialize_model_instance(related_instance, referrers)
             }
         return {field.name: field_value}
 
     def serialize_many_relationship(
-        self, obj: models.Model, referrers: Any = tuple()
+        self,
+        obj: models.Model,
+        referrers: Any = tuple(),
+        model_meta: Optional[ModelMeta] = None,
     ) -> Dict[Any, Any]:
         """
         Serializes many relationship (ManyToMany, ManyToOne) of Django model instance
@@ -228,7 +1078,7 @@ class DjangoSerializer(ModelMetaConfig):
             for k, v in obj._prefetched_objects_cache.items():
                 field_name = k if hasattr(obj, k) else k + "_set"
                 if v:
-                    if self.get_model_join(obj):
+                    if self.get_model_meta(obj, model_meta).model_opts.model_join:
                         out[field_name] = self.serialize_queryset(v, referrers + (obj,))
                     else:
                         out[field_name] = [o.pk for o in v]
@@ -244,18 +1094,41 @@ class DjangoSerializer(ModelMetaConfig):
         """
         return {field.name: getattr(obj, field.name)}
 
-    def serialize_data(self, data: Any) -> Any:
+    def serialize_data(self, data: Any, model_meta: Optional[ModelMeta] = None) -> Any:
+        """
+        Serializes data (queryset, model instance, page) with model_meta (e.g.
+        the one of the controller), the default one of the model if not given
+        """
         out = data
         # Queryset
         if self.is_queryset(data):
-            out = self.serialize_queryset(data)
+            out = self.serialize_queryset(data, model_meta=model_meta)
         # Model
         elif self.is_model_instance(data):
-            out = self.serialize_model_instance(data)
+            out = self.serialize_model_instance(
+                data,
+                plan=self.get_instance_plan(data, model_meta),
+                model_meta=model_meta,
+            )
         # Add limit_off pagination support
         elif self.is_paginated(data):
-            out = self.serialize_queryset(data.get("items"))
+            items = data.get("items")
+            out = (
+                items
+                if isinstance(items, EncodedJSON)
+                else self.serialize_queryset(items, model_meta=model_meta)
+            )
         return out
 
+    def serialize_data_encoded(
+        self, data: Any, model_meta: Optional[ModelMeta] = None
+    ) -> EncodedJSON:
+        """
+        Serialize data, and encode it with the configured JSON backend
+        """
+        return EncodedJSON(
+            get_json_backend().dumps(self.serialize_data(data, model_meta))
+        )
+
 
 django_serializer = DjangoSerializer()
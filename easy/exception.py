@@ -22,3 +22,12 @@ class APIAuthException(BaseAPIException):
 
     status_code = status.HTTP_401_UNAUTHORIZED
     default_detail = _("Unauthorized")
+
+
+class APIServiceUnavailableException(BaseAPIException):
+    """
+    API Service Unavailable Exception, raised when overloaded
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Service temporarily unavailable, please try again later.")
@@ -0,0 +1,154 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from easy.conf import settings as easy_settings
+from easy.exception import APIServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DBExecutor(object):
+    """
+    Bounded executor for the sync DB work of the async APIs.
+    At most max_workers jobs run at a time (size it like the DB connection pool,
+    each worker thread keeps its own connection), up to max_queue more wait for
+    a worker, anything past that is rejected right away with a 503.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 0):
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="easy-db"
+        )
+        self._lock = threading.Lock()
+        # Gauges
+        self.active = 0
+        self.queued = 0
+        # Counters
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def saturated(self) -> bool:
+        return self.active + self.queued >= self.max_workers + self.max_queue
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func in a worker thread, the contextvars of the caller are kept
+        """
+        with self._lock:
+            if self.saturated:
+                self.rejected += 1
+                logger.warning(
+                    f"DB executor saturated - {self.active} active, "
+                    f"{self.queued} queued"
+                )
+                raise APIServiceUnavailableException()
+            self.queued += 1
+        context = contextvars.copy_context()
+        call = partial(func, *args, **kwargs)
+        future = self._executor.submit(self._call, context, time.monotonic(), call)
+        future.add_done_callback(self._release_cancelled)
+        result: T = await asyncio.wrap_future(future)
+        return result
+
+    def _call(
+        self, context: contextvars.Context, submitted: float, call: Callable[[], Any]
+    ) -> Any:
+        wait_time = time.monotonic() - submitted
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+        # Drop unusable or expired connections, as Django does per request
+        close_old_connections()
+        try:
+            return context.run(call)
+        finally:
+            close_old_connections()
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def _release_cancelled(self, future: "Future[Any]") -> None:
+        # A job cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gauges (active, queued) and counters of the executor
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_time_avg": (
+                    self.wait_time_total / self.completed if self.completed else 0.0
+                ),
+                "wait_time_max": self.wait_time_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_db_executor: Optional[DBExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> Optional[DBExecutor]:
+    """
+    The DB executor in use, created from the EASY_API_DB_MAX_WORKERS and
+    EASY_API_DB_MAX_QUEUE settings on first use, None when not configured
+    """
+    global _db_executor
+    if _db_executor is None and easy_settings.EASY_API_DB_MAX_WORKERS:
+        with _db_executor_lock:
+            if _db_executor is None:
+                _db_executor = DBExecutor(
+                    easy_settings.EASY_API_DB_MAX_WORKERS,
+                    easy_settings.EASY_API_DB_MAX_QUEUE,
+                )
+    return _db_executor
+
+
+def set_db_executor(executor: Optional[DBExecutor]) -> None:
+    global _db_executor
+    with _db_executor_lock:
+        _db_executor = executor
+
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run sync DB work from async code, in the DB executor when configured,
+    otherwise in the thread sensitive sync thread
+    """
+    executor = get_db_executor()
+    if executor is not None:
+        return await executor.run(func, *args, **kwargs)
+    return await sync_to_async(func)(*args, **kwargs)
@@ -3,6 +3,7 @@ from importlib import import_module
 from typing import Any, Callable, Optional, Sequence, Union
 
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.http import HttpRequest, HttpResponse
 from django.utils.module_loading import module_has_submodule
 from ninja.constants import NOT_SET, NOT_SET_TYPE
@@ -11,10 +12,19 @@ from ninja.renderers import BaseRenderer
 from ninja.types import TCallable
 from ninja_extra import NinjaExtraAPI
 
+from easy.conf import settings as easy_settings
 from easy.controller.auto_api import create_admin_controller
+from easy.controller.meta_conf import get_request_model_meta
 from easy.domain.orm import django_serializer
+from easy.executor import DBExecutor, get_db_executor, set_db_executor
 from easy.renderer.json import EasyJSONRenderer
-from easy.response import BaseAPIResponse
+from easy.response import (
+    PAGINATION_ATTRIBUTE,
+    BaseAPIResponse,
+    QuerySetStream,
+    StreamingAPIResponse,
+    write_envelope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +38,8 @@ class EasyAPI(NinjaExtraAPI):
         Easy_output: bool = True,
             If True, will be encapsulated in BaseAPIResponse
     -renderer, default to EasyJSONRenderer
+    -db_executor, bounded executor running the sync DB work of the async APIs,
+        default to the one configured by EASY_API_DB_MAX_WORKERS/_MAX_QUEUE
     -Auto generate AdminAPIs, it will read the following settings:
         CRUD_API_ENABLED_ALL_APPS
         CRUD_API_EXCLUDE_APPS
@@ -53,6 +65,7 @@ class EasyAPI(NinjaExtraAPI):
         app_name: str = "ninja",
         easy_extra: bool = True,
         easy_output: bool = True,
+        db_executor: Optional[DBExecutor] = None,
     ) -> None:
         # ninja 1.5+ removed the `csrf` kwarg from NinjaAPI.__init__, and
         # ninja-extra 0.31+ initializes `_controller_routers` (and related state)
@@ -78,6 +91,15 @@ class EasyAPI(NinjaExtraAPI):
         self.app_name = app_name
         self.easy_extra = easy_extra
         self.easy_output = easy_output
+        if db_executor is not None:
+            set_db_executor(db_executor)
+
+    @property
+    def db_executor(self) -> Optional[DBExecutor]:
+        """
+        The DB executor in use, db_executor.stats() exposes its gauges
+        """
+        return get_db_executor()
 
     def auto_create_admin_controllers(self, version: str = None) -> None:
         for app_module in self.get_installed_apps():
@@ -128,27 +150,39 @@ class EasyAPI(NinjaExtraAPI):
         status: int = None,
         temporal_response: HttpResponse = None,
     ) -> HttpResponse:
+        if isinstance(data, QuerySetStream):
+            if temporal_response:
+                status = temporal_response.status_code
+            # ninja only requires a HttpResponseBase here
+            return self.create_streaming_response(  # type: ignore[return-value]
+                request, data, status=status
+            )
+
+        extra = None
         if self.easy_extra:
+            pagination = django_serializer.get_pagination(data)
+            if pagination is not None:
+                extra = {PAGINATION_ATTRIBUTE: pagination}
             try:
-                data = django_serializer.serialize_data(data)
+                data = django_serializer.serialize_data(
+                    data, get_request_model_meta(request)
+                )
             except Exception as e:  # pragma: no cover
                 logger.error(f"Creat Response Error - {e}", exc_info=True)
                 return BaseAPIResponse(str(e), code=500)
 
         if self.easy_output:
             if temporal_response:
-                status = temporal_response.status_code
-            assert status
-
-            _temp = BaseAPIResponse(
-                data, status=status, content_type=self.get_content_type()
-            )
-
-            if temporal_response:
-                response = temporal_response
-                response.content = _temp.content
+                # Encoded once, straight onto the temporal response
+                response = write_envelope(temporal_response, data, extra=extra)
             else:
-                response = _temp
+                assert status
+                response = BaseAPIResponse(
+                    data,
+                    extra=extra,
+                    status=status,
+                    content_type=self.get_content_type(),
+                )
 
         else:
             response = super().create_response(
@@ -159,6 +193,25 @@ class EasyAPI(NinjaExtraAPI):
             )
         return response
 
+    def create_streaming_response(
+        self, request: HttpRequest, data: QuerySetStream, *, status: int = None
+    ) -> StreamingAPIResponse:
+        """
+        Stream the queryset chunk by chunk, async iterated under ASGI
+        """
+        chunk_size = data.chunk_size or easy_settings.EASY_API_STREAM_CHUNK_SIZE
+        if isinstance(request, ASGIRequest):
+            chunks: Any = django_serializer.aserialize_queryset_chunks(
+                data.queryset, chunk_size, get_request_model_meta(request)
+            )
+        else:
+            chunks = django_serializer.serialize_queryset_chunks(
+                data.queryset, chunk_size, get_request_model_meta(request)
+            )
+        return StreamingAPIResponse(
+            chunks, stream_format=data.stream_format, status=status or 200
+        )
+
     def create_temporal_response(self, request: HttpRequest) -> HttpResponse:
         if self.easy_output:
             return BaseAPIResponse("", content_type=self.get_content_type())
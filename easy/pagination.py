@@ -0,0 +1,448 @@
+import binascii
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from django.core.cache import cache
+from django.core.exceptions import (
+    EmptyResultSet,
+    ValidationError as DjangoValidationError,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.http import HttpRequest
+from ninja import Field, Schema
+from ninja.conf import settings as ninja_settings
+from ninja.pagination import AsyncPaginationBase, LimitOffsetPagination
+from ninja_extra.exceptions import ValidationError
+
+from easy.cache import aget_cached_page
+from easy.conf import settings as easy_settings
+from easy.controller.meta_conf import (
+    COUNT_STRATEGY_CACHED,
+    COUNT_STRATEGY_ESTIMATED,
+    COUNT_STRATEGY_EXACT,
+    COUNT_STRATEGY_HAS_MORE,
+    ModelMeta,
+    ModelMetaRegistry,
+    get_request_model_meta,
+)
+from easy.domain.orm import django_serializer
+from easy.executor import run_in_db_executor
+from easy.response import PAGINATION_ATTRIBUTE, QuerySetStream
+
+# Planner estimate of the rows of a table, by database vendor
+ESTIMATED_COUNT_SQL = {
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+    "mysql": (
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s"
+    ),
+}
+
+
+class EasyLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/Offset pagination, page items are kept as a lazy (sliced) QuerySet,
+    DjangoSerializer decides how the rows are fetched when serializing them.
+    The count is made with the APIMeta.count_strategy of the model, and written
+    to the envelope under "pagination", with the strategy that produced it:
+        exact:      COUNT(*)
+        cached:     COUNT(*), cached for EASY_API_COUNT_CACHE_TTL seconds,
+                    keyed by the (normalized) SQL of the filtered queryset
+        estimated:  planner estimate of the table rows (PostgreSQL, MySQL), if
+                    unfiltered, otherwise (or on other backends) cached
+        has_more:   no count, only whether there is a row after the page
+    Under EASY_API_SERIALIZE_IN_WORKER, the async page is counted, read,
+    serialized and encoded in a single worker thread hop.
+    With APIMeta.list_cache, the encoded async pages are cached (see easy.cache).
+    QuerySetStream is streamed as a whole, never paginated.
+    """
+
+    def __init__(self, *, cache_scope: str = "", **kwargs: Any) -> None:
+        # Scope (controller) of the cached pages, see APIMeta.list_cache
+        self.cache_scope = cache_scope
+        super().__init__(**kwargs)
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: LimitOffsetPagination.Input,
+        request: HttpRequest,
+        **params: Any,
+    ) -> Any:
+        if isinstance(queryset, QuerySetStream):
+            return queryset
+        if not isinstance(queryset, QuerySet):
+            return super().paginate_queryset(queryset, pagination, request, **params)
+        offset = pagination.offset
+        limit: int = min(pagination.limit, self.max_limit)
+        model_meta = ModelMetaRegistry.get_model_meta(
+            queryset.model, get_request_model_meta(request)
+        )
+        return self.get_page(queryset, offset, limit, model_meta=model_meta)
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: LimitOffsetPagination.Input,
+        request: HttpRequest,
+        **params: Any,
+    ) -> Any:
+        if isinstance(queryset, QuerySetStream):
+            return queryset
+        if not isinstance(queryset, QuerySet):
+            return await super().apaginate_queryset(
+                queryset, pagination, request, **params
+            )
+        offset = pagination.offset
+        limit: int = min(pagination.limit, self.max_limit)
+        model_meta = ModelMetaRegistry.get_model_meta(
+            queryset.model, get_request_model_meta(request)
+        )
+        if model_meta.model_opts.list_cache:
+            return await aget_cached_page(
+                model_meta,
+                self.cache_scope,
+                queryset,
+                params,
+                {"offset": offset, "limit": limit},
+                partial(
+                    self.get_page,
+                    queryset,
+                    offset,
+                    limit,
+                    encode=True,
+                    model_meta=model_meta,
+                ),
+            )
+        return await run_in_db_executor(
+            self.get_page,
+            queryset,
+            offset,
+            limit,
+            encode=easy_settings.EASY_API_SERIALIZE_IN_WORKER,
+            model_meta=model_meta,
+        )
+
+    def get_page(
+        self,
+        queryset: QuerySet,
+        offset: int,
+        limit: int,
+        encode: bool = False,
+        model_meta: Optional[ModelMeta] = None,
+    ) -> Dict[str, Any]:
+        count = self.get_count(queryset, offset, limit, model_meta)
+        items: Any = queryset[offset : offset + limit]  # noqa: E203
+        if encode:
+            items = django_serializer.serialize_data_encoded(items, model_meta)
+        return {
+            self.items_attribute: items,
+            "count": count["count"],
+            PAGINATION_ATTRIBUTE: count,
+        }
+
+    def get_count(
+        self,
+        queryset: QuerySet,
+        offset: int,
+        limit: int,
+        model_meta: Optional[ModelMeta] = None,
+    ) -> Dict[str, Any]:
+        """
+        Count of the queryset rows, made with the count_strategy of model_meta
+        (of the controller), the default one of the model if not given
+        """
+        model_meta = ModelMetaRegistry.get_model_meta(queryset.model, model_meta)
+        strategy = model_meta.model_opts.count_strategy
+        count: Optional[int] = None
+        if strategy == COUNT_STRATEGY_HAS_MORE:
+            after = queryset[offset + limit : offset + limit + 1]  # noqa: E203
+            has_more = after.values_list("pk").exists()
+            return {"count": None, "has_more": has_more, "count_strategy": strategy}
+        if strategy == COUNT_STRATEGY_ESTIMATED:
+            count = self.get_estimated_count(queryset)
+            if count is None:
+                strategy = COUNT_STRATEGY_CACHED
+        if strategy == COUNT_STRATEGY_CACHED:
+            count = self.get_cached_count(queryset)
+        elif strategy == COUNT_STRATEGY_EXACT:
+            count = self._items_count(queryset)
+        elif count is None:  # pragma: no cover, checked by ModelOptions
+            raise ValueError(f"Unknown count strategy: {strategy}")
+        return {
+            "count": count,
+            "has_more": offset + limit < (count or 0),
+            "count_strategy": strategy,
+        }
+
+    def get_cached_count(self, queryset: QuerySet) -> int:
+        try:
+            sql, sql_params = queryset.order_by().values("pk").query.sql_with_params()
+        except EmptyResultSet:
+            # Provably empty (e.g. pk__in=[]), no SQL to key, nor to run
+            return 0
+        digest = hashlib.md5(f"{queryset.db}:{sql}:{sql_params!r}".encode()).hexdigest()
+        key = f"easy_api:count:{queryset.model._meta.label_lower}:{digest}"
+        count: Optional[int] = cache.get(key)
+        if count is None:
+            count = self._items_count(queryset)
+            cache.set(key, count, easy_settings.EASY_API_COUNT_CACHE_TTL)
+        return count
+
+    @staticmethod
+    def get_estimated_count(queryset: QuerySet) -> Optional[int]:
+        """
+        Planner estimate of the table rows, None if the queryset is filtered,
+        or the backend has none
+        """
+        query = queryset.query
+        if query.where or query.combinator or query.distinct or query.is_sliced:
+            return None
+        connection = connections[queryset.db]
+        sql = ESTIMATED_COUNT_SQL.get(connection.vendor)
+        if sql is None:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if not row or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+class EasyCursorPagination(AsyncPaginationBase):
+    """
+    Keyset (cursor) pagination, select it with APIMeta.pagination_class.
+    Pages are located with a WHERE on the ordering columns (always ending with
+    the pk) instead of OFFSET, and no COUNT is run, so page N costs the same as
+    page 1. Opaque next/previous cursors are returned in the envelope under
+    "pagination", page items are kept as a lazy QuerySet.
+    Ordering defaults to the queryset (or model Meta) ordering, its columns
+    should not be nullable.
+    Under EASY_API_SERIALIZE_IN_WORKER, the async page is located, read,
+    serialized and encoded in a single worker thread hop.
+    With APIMeta.list_cache, the encoded async pages are cached (see easy.cache).
+    QuerySetStream is streamed as a whole, non QuerySet data returned as is.
+    """
+
+    ordering: Tuple[str, ...] = ()
+    page_size: int = ninja_settings.PAGINATION_PER_PAGE
+    max_page_size: int = ninja_settings.PAGINATION_MAX_PER_PAGE_SIZE
+
+    class Input(Schema):
+        cursor: Optional[str] = Field(None, description="next/previous cursor")
+        page_size: Optional[int] = Field(None, ge=1)
+
+    class Output(Schema):
+        items: List[Any]
+        pagination: Dict[str, Optional[str]]
+
+    def __init__(self, *, cache_scope: str = "", **kwargs: Any) -> None:
+        # Scope (controller) of the cached pages, see APIMeta.list_cache
+        self.cache_scope = cache_scope
+        super().__init__(**kwargs)
+
+    def get_ordering(self, queryset: QuerySet) -> Tuple[str, ...]:
+        """
+        Ordering of the pages, made total by ending it with the pk
+        """
+        ordering = [
+            o
+            for o in self.ordering
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+            if isinstance(o, str) and o.lstrip("-") != "?"
+        ]
+        pk_names = ("pk", queryset.model._meta.pk.name)
+        for i, order in enumerate(ordering):
+            if order.lstrip("-") in pk_names:
+                return tuple(ordering[: i + 1])
+        return tuple(ordering) + ("pk",)
+
+    @staticmethod
+    def encode_cursor(values: Sequence[Any], reverse: bool = False) -> str:
+        data = json.dumps({"v": list(values), "r": reverse}, cls=DjangoJSONEncoder)
+        return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def get_ordering_fields(
+        model: Type[models.Model], ordering: Tuple[str, ...]
+    ) -> List[Any]:
+        """
+        Model fields of the ordering columns, following the relations
+        """
+        fields = []
+        for order in ordering:
+            opts: Any = model._meta
+            _field: Any = None
+            for name in order.lstrip("-").split(LOOKUP_SEP):
+                _field = opts.pk if name == "pk" else opts.get_field(name)
+                if _field.is_relation and _field.related_model:
+                    opts = _field.related_model._meta
+            fields.append(_field)
+        return fields
+
+    @staticmethod
+    def decode_cursor(cursor: str, fields: Sequence[Any]) -> Tuple[List[Any], bool]:
+        """
+        Position and direction of a cursor, each value of the position made
+        a valid value of its ordering field
+        """
+        try:
+            data = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            values, reverse = data["v"], data["r"]
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError("Bad position")
+            values = [
+                _field.to_python(value) if hasattr(_field, "to_python") else value
+                for _field, value in zip(fields, values)
+            ]
+            if None in values:
+                raise ValueError("Bad position")
+        except (
+            ValueError,
+            TypeError,
+            KeyError,
+            binascii.Error,
+            DjangoValidationError,
+        ):
+            raise ValidationError(detail="Bad cursor, please check carefully.")
+        return values, bool(reverse)
+
+    @staticmethod
+    def get_keyset_filter(
+        ordering: Tuple[str, ...], values: List[Any], reverse: bool
+    ) -> Q:
+        """
+        Rows strictly after values in ordering (before them if reverse):
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        keyset = Q()
+        for i, order in enumerate(ordering):
+            name = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+            lookups = {o.lstrip("-"): v for o, v in zip(ordering[:i], values)}
+            lookups[f"{name}__{lookup}"] = values[i]
+            keyset |= Q(**lookups)
+        return keyset
+
+    def get_positions_queryset(
+        self, queryset: QuerySet, pagination: Input
+    ) -> Tuple[QuerySet, Tuple[str, ...], bool, int]:
+        """
+        Ordering columns of the rows of the page (plus one, telling whether
+        there are more), read without loading the rows themselves
+        """
+        ordering = self.get_ordering(queryset)
+        page_size = min(pagination.page_size or self.page_size, self.max_page_size)
+        reverse = False
+        qs = queryset
+        if pagination.cursor:
+            values, reverse = self.decode_cursor(
+                pagination.cursor, self.get_ordering_fields(queryset.model, ordering)
+            )
+            qs = qs.filter(self.get_keyset_filter(ordering, values, reverse))
+        if reverse:
+            qs = qs.order_by(
+                *(o[1:] if o.startswith("-") else f"-{o}" for o in ordering)
+            )
+        else:
+            qs = qs.order_by(*ordering)
+        names = [o.lstrip("-") for o in ordering]
+        positions = qs.prefetch_related(None).values_list(*names)[: page_size + 1]
+        return positions, ordering, reverse, page_size
+
+    def get_page(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        ordering: Tuple[str, ...],
+        reverse: bool,
+        page_size: int,
+        positions: List[Tuple[Any, ...]],
+    ) -> Dict[str, Any]:
+        has_more = len(positions) > page_size
+        positions = positions[:page_size]
+        if reverse:
+            positions.reverse()
+        next_cursor = previous_cursor = None
+        if positions:
+            if has_more or reverse:
+                next_cursor = self.encode_cursor(positions[-1])
+            if has_more if reverse else pagination.cursor:
+                previous_cursor = self.encode_cursor(positions[0], reverse=True)
+        pks = [position[-1] for position in positions]
+        return {
+            "items": queryset.filter(pk__in=pks).order_by(*ordering),
+            PAGINATION_ATTRIBUTE: {"next": next_cursor, "previous": previous_cursor},
+        }
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        request: HttpRequest,
+        encode: bool = False,
+        **params: Any,
+    ) -> Any:
+        if not isinstance(queryset, QuerySet):
+            return queryset
+        positions, ordering, reverse, page_size = self.get_positions_queryset(
+            queryset, pagination
+        )
+        page = self.get_page(
+            queryset, pagination, ordering, reverse, page_size, list(positions)
+        )
+        if encode:
+            model_meta = ModelMetaRegistry.get_model_meta(
+                queryset.model, get_request_model_meta(request)
+            )
+            page["items"] = django_serializer.serialize_data_encoded(
+                page["items"], model_meta
+            )
+        return page
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        request: HttpRequest,
+        **params: Any,
+    ) -> Any:
+        if isinstance(queryset, QuerySetStream) or not isinstance(queryset, QuerySet):
+            return queryset
+        model_meta = ModelMetaRegistry.get_model_meta(
+            queryset.model, get_request_model_meta(request)
+        )
+        if model_meta.model_opts.list_cache:
+            return await aget_cached_page(
+                model_meta,
+                self.cache_scope,
+                queryset,
+                params,
+                pagination.dict(),
+                partial(
+                    self.paginate_queryset, queryset, pagination, request, encode=True
+                ),
+            )
+        if easy_settings.EASY_API_SERIALIZE_IN_WORKER:
+            return await run_in_db_executor(
+                self.paginate_queryset, queryset, pagination, request, encode=True
+            )
+        positions, ordering, reverse, page_size = self.get_positions_queryset(
+            queryset, pagination
+        )
+        return self.get_page(
+            queryset,
+            pagination,
+            ordering,
+            reverse,
+            page_size,
+            await run_in_db_executor(list, positions),
+        )
@@ -1,10 +1,26 @@
 import json
-from typing import Any, Type
+from typing import Any, Dict, Type
 
+from django.core.exceptions import ImproperlyConfigured
 from django.db.models.fields.files import FieldFile, ImageFieldFile
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
 from ninja.renderers import JSONRenderer
 from ninja.responses import NinjaJSONEncoder
 
+from easy.conf import settings as easy_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+class EncodedJSON(bytes):
+    """
+    Already encoded JSON, written out as is (e.g. spliced into the envelope)
+    """
+
 
 class EasyJSONEncoder(NinjaJSONEncoder):
     def default(self, o: Any) -> Any:
@@ -19,5 +35,82 @@ class EasyJSONEncoder(NinjaJSONEncoder):
         return super().default(o)
 
 
+class JSONBackend(object):
+    """
+    Encodes data straight to JSON bytes, the same way EasyJSONEncoder does
+    """
+
+    name: str = ""
+
+    def dumps(self, data: Any) -> bytes:
+        raise NotImplementedError  # pragma: no cover
+
+    def loads(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+class StdlibJSONBackend(JSONBackend):
+    name = "stdlib"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, cls=EasyJSONEncoder).encode("utf-8")
+
+
+class OrjsonJSONBackend(JSONBackend):
+    """
+    orjson backend, dates/times are passed through to EasyJSONEncoder so they
+    are formatted the same way as Django does
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImproperlyConfigured("orjson JSON backend requires orjson")
+        self.option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        self.default = EasyJSONEncoder().default
+
+    def dumps(self, data: Any) -> bytes:
+        content: bytes = orjson.dumps(data, default=self.default, option=self.option)
+        return content
+
+    def loads(self, content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+JSON_BACKENDS: Dict[str, Type[JSONBackend]] = {
+    StdlibJSONBackend.name: StdlibJSONBackend,
+    OrjsonJSONBackend.name: OrjsonJSONBackend,
+}
+
+_json_backends: Dict[str, JSONBackend] = {}
+
+
+def get_json_backend() -> JSONBackend:
+    """
+    JSON backend configured by EASY_API_JSON_BACKEND:
+    "auto" (orjson if installed, else stdlib), "orjson", "stdlib",
+    or the dotted path of a JSONBackend subclass
+    """
+    name = easy_settings.EASY_API_JSON_BACKEND
+    backend = _json_backends.get(name)
+    if backend is None:
+        if name == "auto":
+            backend_class = OrjsonJSONBackend if orjson else StdlibJSONBackend
+        elif name in JSON_BACKENDS:
+            backend_class = JSON_BACKENDS[name]
+        else:
+            backend_class = import_string(name)
+        backend = _json_backends.setdefault(name, backend_class())
+    return backend
+
+
 class EasyJSONRenderer(JSONRenderer):
     encoder_class: Type[json.JSONEncoder] = EasyJSONEncoder
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        if isinstance(data, EncodedJSON):
+            return bytes(data)
+        if self.json_dumps_params:
+            return super().render(request, data, response_status=response_status)
+        return get_json_backend().dumps(data)
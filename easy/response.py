@@ -1,14 +1,82 @@
-import json
-from typing import Any, Dict, List, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from django.db.models import QuerySet
-from django.http.response import JsonResponse
+from django.http.response import HttpResponse, JsonResponse, StreamingHttpResponse
 
-from easy.renderer.json import EasyJSONEncoder
+from easy.renderer.json import EncodedJSON, get_json_backend
 
 CODE_SUCCESS = 0
 SUCCESS_MESSAGE = "success"
 
+# Envelope key of the pagination state (e.g. next/previous cursors)
+PAGINATION_ATTRIBUTE = "pagination"
+
+STREAM_FORMAT_NDJSON = "ndjson"
+STREAM_FORMAT_JSON = "json"
+STREAM_CONTENT_TYPES = {
+    STREAM_FORMAT_NDJSON: "application/x-ndjson",
+    STREAM_FORMAT_JSON: "application/json",
+}
+
+
+def get_code_message(code: int = None, message: str = None) -> Tuple[int, str]:
+    if code:
+        message = message or str(code)
+    else:
+        message = message or SUCCESS_MESSAGE
+        code = CODE_SUCCESS
+    return code, message
+
+
+def encode_envelope_head(code: int, message: str) -> bytes:
+    """
+    Envelope encoded up to its data value: {"code":..,"message":..,"data":
+    """
+    dumps = get_json_backend().dumps
+    return b'{"code":%s,"message":%s,"data":' % (dumps(code), dumps(message))
+
+
+def encode_envelope(
+    data: Any = None,
+    code: int = None,
+    message: str = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """
+    Encode the {code, message, data} envelope (extra keys appended), data is
+    encoded only once, EncodedJSON data is spliced into the envelope as is
+    """
+    code, message = get_code_message(code, message)
+    dumps = get_json_backend().dumps
+    if not isinstance(data, EncodedJSON):
+        data = dumps(data if data is not None else {})
+    tail = b"".join(b",%s:%s" % (dumps(k), dumps(v)) for k, v in (extra or {}).items())
+    return encode_envelope_head(code, message) + data + tail + b"}"
+
+
+def write_envelope(
+    response: HttpResponse,
+    data: Any = None,
+    code: int = None,
+    message: str = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> HttpResponse:
+    """
+    Write the encoded envelope directly onto the response
+    """
+    response.content = encode_envelope(data, code=code, message=message, extra=extra)
+    return response
+
 
 class BaseAPIResponse(JsonResponse):
     """
@@ -17,34 +85,112 @@ class BaseAPIResponse(JsonResponse):
 
     def __init__(
         self,
-        data: Union[Dict, str, bool, List[Any], QuerySet] = None,
+        data: Union[Dict, str, bool, List[Any], QuerySet, EncodedJSON] = None,
         code: int = None,
         message: str = None,
-        **kwargs: Any
+        extra: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
     ):
-        if code:
-            message = message or str(code)
-        else:
-            message = message or SUCCESS_MESSAGE
-            code = CODE_SUCCESS
-
-        _data: Union[Dict, str] = {
-            "code": code,
-            "message": message,
-            "data": data if data is not None else {},
-        }
-
-        super().__init__(data=_data, encoder=EasyJSONEncoder, **kwargs)
+        # Encoded straight to bytes by the configured JSON backend
+        kwargs.setdefault("content_type", "application/json")
+        super(JsonResponse, self).__init__(
+            content=encode_envelope(data, code=code, message=message, extra=extra),
+            **kwargs,
+        )
 
     @property
     def json_data(self) -> Any:
         """
-        Get json data
+        Get json data, decoded once per content
         """
-        return json.loads(self.content)
+        container = getattr(self, "_container", None)
+        cached = getattr(self, "_json_data_cache", None)
+        if cached is None or cached[0] is not container:
+            cached = (container, get_json_backend().loads(self.content))
+            self._json_data_cache = cached
+        return cached[1]
 
     def update_content(self, data: Dict) -> None:
         """
         Update content with new data
         """
-        self.content = json.dumps(data)
+        self.content = get_json_backend().dumps(data)
+
+
+class QuerySetStream(object):
+    """
+    Return it from an API to stream the queryset instead of paginating it,
+    or building the whole response in memory
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        stream_format: str = STREAM_FORMAT_JSON,
+        chunk_size: int = None,
+    ):
+        if stream_format not in STREAM_CONTENT_TYPES:
+            raise ValueError(f"Unknown stream format: {stream_format}")
+        self.queryset = queryset
+        self.stream_format = stream_format
+        self.chunk_size = chunk_size
+
+
+class StreamingAPIResponse(StreamingHttpResponse):
+    """
+    Streams chunks of serialized rows, either as NDJSON (one row per line),
+    or written incrementally into the BaseAPIResponse envelope
+    """
+
+    def __init__(
+        self,
+        chunks: Union[Iterable[List[Any]], AsyncIterator[List[Any]]],
+        stream_format: str = STREAM_FORMAT_JSON,
+        code: int = None,
+        message: str = None,
+        **kwargs: Any,
+    ):
+        self.stream_format = stream_format
+        if stream_format == STREAM_FORMAT_JSON:
+            self._head = encode_envelope_head(*get_code_message(code, message)) + b"["
+            self._tail = b"]}"
+        else:
+            self._head = self._tail = b""
+        kwargs.setdefault("content_type", STREAM_CONTENT_TYPES[stream_format])
+        if hasattr(chunks, "__aiter__"):
+            content: Any = self._astream(chunks)  # type: ignore
+        else:
+            content = self._stream(chunks)
+        super().__init__(content, **kwargs)
+
+    @staticmethod
+    def encode(data: Any) -> bytes:
+        return get_json_backend().dumps(data)
+
+    def encode_rows(self, rows: List[Any], first: bool) -> bytes:
+        if self.stream_format == STREAM_FORMAT_NDJSON:
+            return b"".join(self.encode(row) + b"\n" for row in rows)
+        content = b",".join(self.encode(row) for row in rows)
+        return content if first else b"," + content
+
+    def _stream(self, chunks: Iterable[List[Any]]) -> Iterator[bytes]:
+        if self._head:
+            yield self._head
+        first = True
+        for rows in chunks:
+            if rows:
+                yield self.encode_rows(rows, first)
+                first = False
+        if self._tail:
+            yield self._tail
+
+    async def _astream(self, chunks: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+        if self._head:
+            yield self._head
+        first = True
+        async for rows in chunks:
+            if rows:
+                yield self.encode_rows(rows, first)
+                first = False
+        if self._tail:
+            yield self._tail
@@ -3,6 +3,7 @@ from typing import Optional, Type
 
 from django.db import models
 
+from easy.controller.meta_conf import ModelMeta
 from easy.services.crud import CrudService
 from easy.services.permission import PermissionService
 
@@ -10,6 +11,10 @@ logger = logging.getLogger(__name__)
 
 
 class BaseService(CrudService, PermissionService):
-    def __init__(self, model: Optional[Type[models.Model]] = None):
+    def __init__(
+        self,
+        model: Optional[Type[models.Model]] = None,
+        model_meta: Optional[ModelMeta] = None,
+    ):
         self.model = model
-        super().__init__(model=self.model)
+        super().__init__(model=self.model, model_meta=model_meta)
@@ -1,42 +1,115 @@
 import logging
-from typing import Any, Optional, Type
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Type
 
-from asgiref.sync import sync_to_async
 from django.db import models
 
-from easy.domain.orm import DjangoOrmModel
+from easy.cache import aget_cached_object, aset_cached_object
+from easy.controller.meta_conf import ModelMeta
+from easy.domain.orm import DjangoOrmModel, django_serializer
+from easy.executor import run_in_db_executor
+from easy.renderer.json import EncodedJSON
 
 logger = logging.getLogger(__name__)
 
 
 class CrudService(DjangoOrmModel):
-    def __init__(self, model: Optional[Type[models.Model]] = None):
-        super().__init__(model)
+    def __init__(
+        self,
+        model: Optional[Type[models.Model]] = None,
+        model_meta: Optional[ModelMeta] = None,
+    ):
+        super().__init__(model, model_meta=model_meta)
         self.model = model
 
-    async def get_obj(self, id: int) -> Any:
-        return await sync_to_async(self.crud_get_obj)(id)
+    async def get_obj(self, id: int, fieldset: Optional[FrozenSet[str]] = None) -> Any:
+        return await self.acrud_get_obj(id, fieldset=fieldset)
 
-    async def get_objs(self, **filters: Any) -> Any:
-        return await sync_to_async(self.crud_get_objs_all)(**filters)
+    async def get_obj_encoded(
+        self, id: int, fieldset: Optional[FrozenSet[str]] = None
+    ) -> Any:
+        """
+        get_obj, serialized and encoded in a worker thread: a single hop unless
+        get_obj is overridden, whose result is then serialized in a second one
+        """
+        if type(self).get_obj is CrudService.get_obj:
+            return await run_in_db_executor(
+                self.crud_get_obj_encoded, id, fieldset=fieldset
+            )
+        obj = await self.get_obj(id, fieldset=fieldset)
+        if not django_serializer.is_model_instance(obj):
+            return obj
+        return await self.serialize(obj)
+
+    async def get_obj_cached(
+        self, id: int, fieldset: Optional[FrozenSet[str]] = None, scope: str = ""
+    ) -> Any:
+        """
+        get_obj_encoded (so get_obj), read through the object cache (APIMeta
+        cache option), entries are kept apart by scope (controller), not by
+        request: get_obj must not depend on it (e.g. filter per user)
+        """
+        cached, version = await aget_cached_object(self.model_meta, scope, id, fieldset)
+        if cached is not None:
+            return cached
+        encoded = await self.get_obj_encoded(id, fieldset=fieldset)
+        if isinstance(encoded, EncodedJSON):
+            await aset_cached_object(
+                self.model_meta, scope, id, fieldset, encoded, version
+            )
+        return encoded
+
+    async def serialize(self, data: Any) -> EncodedJSON:
+        """
+        Evaluate (queryset), serialize and encode data in a single worker thread hop
+        """
+        return await run_in_db_executor(
+            django_serializer.serialize_data_encoded, data, self.model_meta
+        )
+
+    async def get_objs(
+        self, fieldset: Optional[FrozenSet[str]] = None, **filters: Any
+    ) -> Any:
+        return await self.acrud_get_objs_all(fieldset=fieldset, **filters)
 
     async def patch_obj(self, id: int, payload: Any) -> Any:
-        return await sync_to_async(self.crud_update_obj)(id, payload)
+        return await self.acrud_update_obj(id, payload)
+
+    async def bulk_patch_objs(self, payloads: List[Dict]) -> List[Any]:
+        """
+        Patch multiple objects, payloads: [{"id": pk, **changes}], the changes
+        of a pk given more than once are merged in order
+        """
+        changes: Dict[Any, Dict] = defaultdict(dict)
+        for payload in payloads:
+            payload = dict(payload)
+            changes[payload.pop("id")].update(payload)
+        return await self.acrud_bulk_update_objs(dict(changes))
 
     async def del_obj(self, id: int) -> Any:
-        return await sync_to_async(self.crud_del_obj)(id)
+        return await self.acrud_del_obj(id)
+
+    async def bulk_upsert_objs(
+        self, payloads: List[Dict], unique_fields: Sequence[str]
+    ) -> List[Any]:
+        return await self.acrud_bulk_upsert_objs(payloads, unique_fields)
+
+    async def bulk_del_objs(
+        self, dry_run: bool = False, **filters: Any
+    ) -> Tuple[int, Dict[str, int]]:
+        return await self.acrud_bulk_del_objs(dry_run=dry_run, **filters)
 
     async def add_obj(self, **payload: Any) -> Any:
-        return await sync_to_async(self.crud_add_obj)(**payload)
+        return await self.acrud_add_obj(**payload)
+
+    async def bulk_add_objs(self, payloads: List[Dict]) -> List[Any]:
+        return await self.acrud_bulk_add_objs(payloads)
 
     async def filter_objs(self, **payload: Any) -> Any:
-        return await sync_to_async(self.crud_filter)(**payload)  # pragma: no cover
+        return await self.acrud_filter(**payload)  # pragma: no cover
 
     async def filter_exclude_objs(self, **payload: Any) -> Any:
-        return await sync_to_async(self.crud_filter_exclude)(**payload)
+        return await self.acrud_filter_exclude(**payload)
 
-    # async def bulk_create_objs(self):
-    #     ...
-    #
     # async def recover_obj(self):
     #     ...
@@ -1,5 +1,9 @@
 import functools
+import itertools
 import types
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
 
 
 def copy_func(f):  # type: ignore
@@ -13,3 +17,13 @@ def copy_func(f):  # type: ignore
     n = functools.update_wrapper(n, f)
     n.__kwdefaults__ = f.__kwdefaults__
     return n
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split iterable into lists of (at most) size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
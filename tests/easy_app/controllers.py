@@ -4,6 +4,7 @@ from asgiref.sync import sync_to_async
 from ninja_extra import api_controller, http_get, paginate
 
 from easy.controller.base import CrudAPIController
+from easy.pagination import EasyCursorPagination
 from easy.permissions import (
     AdminSitePermission,
     BaseApiPermission,
@@ -15,7 +16,7 @@ from easy.response import BaseAPIResponse
 
 from .models import Client, Event
 from .schema import EventSchema
-from .services import EventService
+from .services import EventService, MineEventService
 
 
 @api_controller("unittest", permissions=[BaseApiPermission])
@@ -82,6 +83,86 @@ class AutoGenCrudNoJoinAPIController(CrudAPIController):
         sensitive_fields = ["password", "sensitive_info"]
 
 
+class EventCursorPagination(EasyCursorPagination):
+    ordering = ("-start_date",)
+    page_size = 2
+
+
+@api_controller("unittest", permissions=[BaseApiPermission])
+class CursorPaginationAPIController(CrudAPIController):
+    """
+    For unit testings of cursor pagination
+    """
+
+    def __init__(self, service: EventService):
+        super().__init__(service)
+
+    class APIMeta:
+        model = Event
+        pagination_class = EventCursorPagination
+
+
+@api_controller("unittest", permissions=[BaseApiPermission])
+class CachedAPIController(CrudAPIController):
+    """
+    For unit testings of the object and list caches
+    """
+
+    def __init__(self, service: EventService):
+        super().__init__(service)
+
+    class APIMeta:
+        model = Event
+        model_join = True
+        cache = 60
+        list_cache = 60
+
+
+@api_controller("unittest", permissions=[BaseApiPermission])
+class MineCachedAPIController(CrudAPIController):
+    """
+    For unit testings of the caches of controllers with the same options
+    """
+
+    def __init__(self, service: MineEventService):
+        super().__init__(service)
+
+    class APIMeta:
+        model = Event
+        model_join = True
+        cache = 60
+        list_cache = 60
+
+
+@api_controller("unittest", permissions=[BaseApiPermission])
+class SensitiveM2MAPIController(CrudAPIController):
+    """
+    For unit testings of sensitive m2m fields, writable but never shown
+    """
+
+    def __init__(self, service: EventService):
+        super().__init__(service)
+
+    class APIMeta:
+        model = Event
+        model_join = True
+        sensitive_fields = ["password", "lead_owner"]
+
+
+@api_controller("unittest", permissions=[BaseApiPermission])
+class MineAPIController(CrudAPIController):
+    """
+    For unit testings of service get_obj/get_objs overrides
+    """
+
+    def __init__(self, service: MineEventService):
+        super().__init__(service)
+
+    class APIMeta:
+        model = Event
+        model_join = True
+
+
 @api_controller("unittest", permissions=[BaseApiPermission])
 class AutoGenCrudSomeFieldsAPIController(CrudAPIController):
     """
@@ -6,6 +6,17 @@ class TestBaseModel(models.Model):
         abstract = True
 
 
+class NameSlugField(models.CharField):
+    """
+    Slug of the name of the object, set on save, for unit testings of pre_save
+    """
+
+    def pre_save(self, model_instance, add):
+        value = (model_instance.name or "").lower().replace(" ", "-")
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class Category(TestBaseModel):
     title = models.CharField(max_length=100)
     status = models.PositiveSmallIntegerField(default=1, null=True)
@@ -19,10 +30,12 @@ class Client(TestBaseModel):
     name = models.CharField(max_length=50, null=True)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True)
     password = models.CharField(max_length=30, null=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
 
 class Type(TestBaseModel):
     name = models.CharField(max_length=50, null=True)
+    slug = NameSlugField(max_length=50, null=True)
     status = models.PositiveSmallIntegerField(default=1, null=True)
 
 
@@ -49,3 +62,19 @@ class Event(TestBaseModel):
 
     def __str__(self):
         return self.title
+
+
+class Tag(TestBaseModel):
+    """
+    For unit testings of upserts on a unique field, symmetrical m2m to self,
+    and of save() overridden
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    note = models.CharField(max_length=100, null=True)
+    clients = models.ManyToManyField(Client, related_name="+", blank=True)
+    related = models.ManyToManyField("self", blank=True)
+
+    def save(self, *args, **kwargs):
+        self.name = self.name.lower()
+        super().save(*args, **kwargs)
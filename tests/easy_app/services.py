@@ -49,3 +49,20 @@ class EventService(BaseService):
         return bool(request.user.is_superuser) and super().check_object_permission(
             request, controller, obj
         )
+
+
+class MineEventService(EventService):
+    """
+    Only the events titled mine*, for unit testing of get_obj/get_objs overrides
+    """
+
+    async def get_obj(self, id, fieldset=None):
+        obj = await super().get_obj(id, fieldset=fieldset)
+        if obj is not None and obj.title.startswith("mine"):
+            return obj
+        return None
+
+    async def get_objs(self, fieldset=None, **filters):
+        return await super().get_objs(
+            fieldset=fieldset, title__startswith="mine", **filters
+        )
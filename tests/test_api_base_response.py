@@ -1,8 +1,29 @@
 import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from uuid import UUID
 
 import pytest
-
-from easy.response import BaseAPIResponse
+from django.db.models.fields.files import FieldFile
+from django.utils.translation import gettext_lazy
+
+from easy.renderer.json import (
+    JSON_BACKENDS,
+    EasyJSONEncoder,
+    EasyJSONRenderer,
+    EncodedJSON,
+    StdlibJSONBackend,
+    get_json_backend,
+)
+from easy.response import (
+    STREAM_FORMAT_NDJSON,
+    BaseAPIResponse,
+    StreamingAPIResponse,
+    encode_envelope,
+    write_envelope,
+)
+
+from .easy_app.models import Event
 
 
 def test_base_api_result_base():
@@ -63,3 +84,87 @@ def test_base_api_edit():
     data["data"]["im"] = 8888
     orig_resp.update_content(data)
     assert orig_resp.json_data["data"]["im"] == 8888
+
+
+def test_encode_envelope():
+    for data in (None, "", [1, 2], {"a": "b"}):
+        assert json.loads(encode_envelope(data)) == BaseAPIResponse(data).json_data
+    assert json.loads(encode_envelope([], code=404)) == {
+        "code": 404,
+        "message": "404",
+        "data": [],
+    }
+
+    # Already encoded data is spliced in, not encoded twice
+    content = encode_envelope(EncodedJSON(b'[{"a":1}]'), message="ok")
+    assert json.loads(content) == {"code": 0, "message": "ok", "data": [{"a": 1}]}
+    renderer = EasyJSONRenderer()
+    assert renderer.render(None, EncodedJSON(b"[1]"), response_status=200) == b"[1]"
+
+    response = write_envelope(BaseAPIResponse(""), {"a": 1})
+    assert response.json_data == {"code": 0, "message": "success", "data": {"a": 1}}
+
+
+def test_base_api_json_data_cached():
+    response = BaseAPIResponse({"a": 1})
+    assert response.json_data is response.json_data
+    response.content = encode_envelope({"a": 2})
+    assert response.json_data["data"] == {"a": 2}
+
+
+def test_streaming_api_response():
+    chunks = [[{"a": 1}, {"a": 2}], [], [{"a": 3}]]
+    response = StreamingAPIResponse(iter(chunks))
+    assert response["Content-Type"] == "application/json"
+    data = json.loads(b"".join(response.streaming_content))
+    assert data == BaseAPIResponse([{"a": 1}, {"a": 2}, {"a": 3}]).json_data
+
+    response = StreamingAPIResponse(iter([]), code=404, message="Not Found")
+    assert json.loads(b"".join(response.streaming_content)) == {
+        "code": 404,
+        "message": "Not Found",
+        "data": [],
+    }
+
+    response = StreamingAPIResponse(iter(chunks), stream_format=STREAM_FORMAT_NDJSON)
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).splitlines()
+    assert [json.loads(line) for line in lines] == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+async def test_streaming_api_response_async():
+    async def chunks():
+        yield [{"a": 1}]
+        yield [{"a": 2}]
+
+    response = StreamingAPIResponse(chunks())
+    content = b"".join([part async for part in response.streaming_content])
+    assert json.loads(content)["data"] == [{"a": 1}, {"a": 2}]
+
+
+def test_json_backends(settings):
+    data = {
+        "date": date(2022, 1, 2),
+        "datetime": datetime(2022, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "time": time(3, 4, 5, 678901),
+        "decimal": Decimal("1.10"),
+        "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("Unauthorized"),
+        "file": FieldFile(None, Event._meta.get_field("photo"), None),
+        1: [True, None, 1.5],
+    }
+    expected = json.loads(json.dumps(data, cls=EasyJSONEncoder))
+    assert expected["datetime"] == "2022-01-02T03:04:05.678Z"
+
+    for backend in JSON_BACKENDS.values():
+        content = backend().dumps(data)
+        assert isinstance(content, bytes)
+        assert json.loads(content) == expected
+
+    settings.EASY_API_JSON_BACKEND = "stdlib"
+    assert isinstance(get_json_backend(), StdlibJSONBackend)
+    assert BaseAPIResponse(data).json_data["data"] == expected
+
+    settings.EASY_API_JSON_BACKEND = "easy.renderer.json.OrjsonJSONBackend"
+    assert get_json_backend().name == "orjson"
+    assert BaseAPIResponse(data).json_data["data"] == expected
@@ -5,15 +5,20 @@ import django
 import pytest
 from asgiref.sync import sync_to_async
 
+from easy.pagination import EasyCursorPagination
+
 from .easy_app.controllers import (
     AutoGenCrudAPIController,
     AutoGenCrudNoJoinAPIController,
     AutoGenCrudSomeFieldsAPIController,
+    CursorPaginationAPIController,
     EventSchema,
     InheritedRecursiveAPIController,
+    MineAPIController,
     NoCrudAPIController,
     NoCrudInheritedAPIController,
     RecursiveAPIController,
+    SensitiveM2MAPIController,
 )
 from .easy_app.models import Category, Client, Event, Type
 
@@ -205,6 +210,159 @@ class TestAutoCrudAdminAPI:
         assert response.status_code == 200
         assert response.json().get("data")["title"] == "AsyncAdminAPIEvent_create"
 
+    async def test_crud_bulk_create(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+        client_c = await sync_to_async(Client.objects.create)(key="C")
+        items = [
+            dict(dummy_data, title=f"Bulk {i}", owner=[client_c.id]) for i in range(3)
+        ]
+
+        response = await client.put(
+            "/bulk", json=items, content_type="application/json"
+        )
+        assert response.status_code == 200
+        assert response.json()["code"] == 201
+        ids = response.json()["data"]["ids"]
+        assert len(ids) == 3
+
+        response = await client.get(f"/{ids[2]}")
+        assert response.json()["data"]["title"] == "Bulk 2"
+        assert response.json()["data"]["owner"][0]["key"] == "C"
+
+        response = await client.put(
+            "/bulk", json=[dict(start_date="bad")], content_type="application/json"
+        )
+        assert response.status_code == 422
+
+    async def test_crud_partial_patch(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+        event = await sync_to_async(Event.objects.create)(**dummy_data)
+
+        response = await client.patch(
+            f"/{event.id}", json=dict(end_date=None), content_type="application/json"
+        )
+        assert response.json()["message"] == "Updated."
+        data = (await client.get(f"/{event.id}")).json()["data"]
+        assert data["title"] == dummy_data["title"]
+        assert data["start_date"] == dummy_data["start_date"]
+        assert data["end_date"] is None
+
+    async def test_crud_bulk_patch(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+        client_c = await sync_to_async(Client.objects.create)(key="C")
+        events = [
+            await sync_to_async(Event.objects.create)(title=f"Bulk {i}")
+            for i in range(2)
+        ]
+        items = [
+            dict(id=events[0].id, title="Bulk patched"),
+            dict(id=events[1].id, owner=[client_c.id]),
+            dict(id=20000, title="Missing"),
+        ]
+
+        response = await client.patch(
+            "/bulk", json=items, content_type="application/json"
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "Updated."
+        assert sorted(response.json()["data"]["ids"]) == [e.id for e in events]
+        assert response.json()["data"]["not_found"] == [20000]
+
+        data = (await client.get(f"/{events[0].id}")).json()["data"]
+        assert (data["title"], data["owner"]) == ("Bulk patched", [])
+        data = (await client.get(f"/{events[1].id}")).json()["data"]
+        assert (data["title"], data["owner"][0]["key"]) == ("Bulk 1", "C")
+
+        response = await client.patch(
+            "/bulk", json=[dict(title="No id")], content_type="application/json"
+        )
+        assert response.status_code == 422
+
+    async def test_crud_bulk_delete(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+        events = [
+            await sync_to_async(Event.objects.create)(title=f"Bulk {i}")
+            for i in range(3)
+        ]
+        filters = json.dumps(dict(title__startswith="Bulk"))
+
+        response = await client.delete(f"/bulk?filters={filters}&dry_run=true")
+        assert response.json()["data"] == {"count": 3}
+        response = await client.delete("/bulk")
+        assert response.status_code == 400
+        for bad_filters in (
+            dict(unknown=1),
+            dict(start_date="bad"),
+            dict(id="x"),
+            dict(id__in=1),
+            dict(id__range=1),
+            [1],
+        ):
+            response = await client.delete(
+                "/bulk", query=dict(filters=json.dumps(bad_filters))
+            )
+            assert response.status_code == 400
+
+        response = await client.delete(f"/bulk?ids={events[0].id},{events[1].id}")
+        assert response.json()["message"] == "Deleted."
+        assert response.json()["data"] == {
+            "count": 2,
+            "deleted": {"easy_app.Event": 2},
+        }
+        response = await client.delete(f"/bulk?filters={filters}")
+        assert response.json()["data"]["count"] == 1
+        assert not await Event.objects.filter(title__startswith="Bulk").aexists()
+
+    async def test_crud_sensitive_m2m(self, transactional_db, easy_api_client):
+        client = easy_api_client(SensitiveM2MAPIController)
+        client_a = await sync_to_async(Client.objects.create)(key="A")
+
+        response = await client.put(
+            "/", json=dict(title="Sensitive", lead_owner=[client_a.id])
+        )
+        assert response.status_code == 200
+        event_id = response.json()["data"]["id"]
+        event = await Event.objects.aget(pk=event_id)
+        assert [c.pk async for c in event.lead_owner.all()] == [client_a.id]
+        response = await client.patch(f"/{event_id}", json=dict(lead_owner=[]))
+        assert response.json()["message"] == "Updated."
+        response = await client.get(f"/{event_id}")
+        assert "lead_owner" not in response.json()["data"]
+        event = await Event.objects.aget(pk=event_id)
+        assert not await event.lead_owner.aexists()
+
+    async def test_crud_upsert(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudSomeFieldsAPIController)
+        client_a = await sync_to_async(Client.objects.create)(key="A", name="Old A")
+        items = [dict(key="A", name="New A"), dict(key="B", name="New B")]
+
+        response = await client.put(
+            "/upsert?unique_fields=key", json=items, content_type="application/json"
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "Upserted."
+        ids = response.json()["data"]["ids"]
+        assert ids[0] == client_a.id
+
+        response = await client.get(f"/{ids[1]}")
+        assert response.json()["data"]["name"] == "New B"
+        assert await Client.objects.acount() == 2
+
+        # Fields left out are not written
+        response = await client.put(
+            "/upsert?unique_fields=key",
+            json=[dict(key="A"), dict(key="B", name="Newer B")],
+            content_type="application/json",
+        )
+        assert response.json()["data"]["ids"] == ids
+        names = {c.key: c.name async for c in Client.objects.all()}
+        assert names == {"A": "New A", "B": "Newer B"}
+
+        response = await client.put(
+            "/upsert?unique_fields=name", json=items, content_type="application/json"
+        )
+        assert response.status_code == 400
+
     async def test_crud_default_create_some_fields(
         self, transactional_db, easy_api_client
     ):
@@ -302,4 +460,145 @@ class TestAutoCrudAdminAPI:
         )
         assert response.status_code == 200
         data = response.json().get("data")
-        assert data["owner"] == [8, 9]
+        assert data["owner"] == [client_e.pk, client_f.pk]
+
+    async def test_crud_default_get_fields(self, transactional_db, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+
+        client_a = await sync_to_async(Client.objects.create)(key="A")
+        category = await sync_to_async(Category.objects.create)(title="Category")
+        event = await sync_to_async(Event.objects.create)(
+            title="Fields", category=category, start_date=dummy_data["start_date"]
+        )
+        await sync_to_async(event.owner.set)([client_a])
+
+        response = await client.get(f"/{event.id}", query=dict(fields="title,owner"))
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert set(data) == {"id", "title", "owner"}
+        assert data["owner"][0]["key"] == "A"
+
+        response = await client.get(
+            "/", query=dict(fields="title,category,start_date", exclude="start_date")
+        )
+        assert response.json()["data"] == [
+            {"id": event.id, "title": "Fields", "category": category.id}
+        ]
+
+        response = await client.get("/", query=dict(exclude="owner,lead_owner"))
+        data = response.json()["data"][0]
+        assert "owner" not in data and "lead_owner" not in data
+        assert data["start_date"] == dummy_data["start_date"]
+
+        response = await client.get("/", query=dict(fields="title,unknown"))
+        assert response.status_code == 400
+        response = await client.get(f"/{event.id}", query=dict(fields="sensitive"))
+        assert response.status_code == 400
+
+    async def test_crud_get_all_cursor(self, transactional_db, easy_api_client):
+        client = easy_api_client(CursorPaginationAPIController)
+
+        start_date = datetime.now().date()
+        for i in range(5):
+            await sync_to_async(Event.objects.create)(
+                title=f"Cursor {i}", start_date=start_date + timedelta(days=i // 2)
+            )
+        expected = [f"Cursor {i}" for i in (4, 2, 3, 0, 1)]
+
+        response = await client.get("/")
+        assert response.status_code == 200
+        pages = [response.json()]
+        while pages[-1]["pagination"]["next"]:
+            response = await client.get(
+                "/", query=dict(cursor=pages[-1]["pagination"]["next"])
+            )
+            pages.append(response.json())
+        assert [e["title"] for page in pages for e in page["data"]] == expected
+        assert [len(page["data"]) for page in pages] == [2, 2, 1]
+        assert pages[0]["pagination"]["previous"] is None
+
+        response = await client.get(
+            "/", query=dict(cursor=pages[-1]["pagination"]["previous"])
+        )
+        assert response.json() == pages[1]
+
+        response = await client.get("/", query=dict(cursor="bad"))
+        assert response.status_code == 400
+        # Decoding, but tampered with: values not of the ordering fields
+        for position in (["bad", 1], [str(start_date), "bad"], [None, 1], [[], 1]):
+            cursor = EasyCursorPagination.encode_cursor(position)
+            response = await client.get("/", query=dict(cursor=cursor))
+            assert response.status_code == 400
+
+    async def test_crud_serialize_in_worker(
+        self, transactional_db, easy_api_client, settings
+    ):
+        client_a = await sync_to_async(Client.objects.create)(key="A")
+        for i in range(3):
+            event = await sync_to_async(Event.objects.create)(
+                title=f"Worker {i}", start_date=dummy_data["start_date"]
+            )
+            await sync_to_async(event.owner.set)([client_a])
+
+        responses = []
+        for serialize_in_worker in (False, True):
+            settings.EASY_API_SERIALIZE_IN_WORKER = serialize_in_worker
+            for controller in (AutoGenCrudAPIController, CursorPaginationAPIController):
+                client = easy_api_client(controller)
+                responses.append((await client.get("/", query=dict(limit=2))).json())
+                responses.append((await client.get(f"/{event.id}")).json())
+                responses.append((await client.get("/20000")).json())
+        assert responses[:6] == responses[6:]
+        assert responses[0]["data"][0]["owner"][0]["key"] == "A"
+        assert responses[2]["code"] == 404
+
+    @pytest.mark.parametrize("serialize_in_worker", [False, True])
+    async def test_crud_get_obj_service_override(
+        self, transactional_db, easy_api_client, settings, serialize_in_worker
+    ):
+        settings.EASY_API_SERIALIZE_IN_WORKER = serialize_in_worker
+        client = easy_api_client(MineAPIController)
+        mine = await sync_to_async(Event.objects.create)(title="mine")
+        other = await sync_to_async(Event.objects.create)(title="other")
+
+        response = await client.get(f"/{mine.id}")
+        assert response.json()["data"]["title"] == "mine"
+        response = await client.get(f"/{other.id}")
+        assert response.json()["code"] == 404
+
+    async def test_crud_default_get_all_stream(
+        self, transactional_db, easy_api_client, monkeypatch
+    ):
+        # The test client consumes the streamed (sync) content on the event loop
+        monkeypatch.setenv("DJANGO_ALLOW_ASYNC_UNSAFE", "true")
+        client = easy_api_client(AutoGenCrudAPIController)
+
+        client_a = await sync_to_async(Client.objects.create)(key="A")
+        for i in range(3):
+            event = await sync_to_async(Event.objects.create)(
+                title=f"Stream {i}", start_date=dummy_data["start_date"]
+            )
+            await sync_to_async(event.owner.set)([client_a])
+
+        response = await client.get(
+            "/", query=dict(filters=json.dumps(dict(title__startswith="Stream")))
+        )
+        paginated = response.json()
+
+        response = await client.get(
+            "/",
+            query=dict(
+                filters=json.dumps(dict(title__startswith="Stream")), stream="json"
+            ),
+        )
+        assert response.status_code == 200
+        assert response.streaming
+        assert paginated.pop("pagination")["count"] == 3
+        assert response.json() == paginated
+        assert len(paginated["data"]) == 3
+
+        response = await client.get("/", query=dict(stream="ndjson"))
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.content.splitlines()]
+        assert [row["title"] for row in rows] == [f"Stream {i}" for i in range(3)]
+        assert rows[0]["owner"][0]["key"] == "A"
@@ -21,16 +21,18 @@ for path, rtr in api_admin_v1._routers:
 
 
 def test_auto_generate_admin_api():
-    assert len(api_admin_v1._routers) == 5  # default + 3 models
+    assert len(api_admin_v1._routers) == 6  # default + 5 models
     assert "/easy_app/category" in path_names
     assert "/easy_app/client" in path_names
     assert "/easy_app/event" in path_names
     assert "/easy_app/type" in path_names
+    assert "/easy_app/tag" in path_names
 
     assert "CategoryAdminAPIController" in controller_names
     assert "EventAdminAPIController" in controller_names
     assert "ClientAdminAPIController" in controller_names
     assert "TypeAdminAPIController" in controller_names
+    assert "TagAdminAPIController" in controller_names
 
 
 async def test_auto_apis(transactional_db, user, easy_api_client):
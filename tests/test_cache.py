@@ -0,0 +1,240 @@
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+from easy.cache import (
+    aget_cached_object,
+    aget_cached_page,
+    aget_generation,
+    aset_cached_object,
+    bump_generation,
+    get_generation_key,
+    get_list_cache_key,
+    get_object_version_key,
+    invalidate_objects,
+)
+from easy.renderer.json import EncodedJSON
+
+from .easy_app.controllers import CachedAPIController, MineCachedAPIController
+from .easy_app.models import Client, Event
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestObjectCache:
+    async def test_read_through(self, transactional_db, easy_api_client):
+        client = easy_api_client(CachedAPIController)
+        event = await sync_to_async(Event.objects.create)(title="Cached")
+        response = await client.get(f"/{event.id}")
+        assert response.json()["data"]["title"] == "Cached"
+        response = await client.get(f"/{event.id}", query=dict(fields="id,title"))
+        assert response.json()["data"] == {"id": event.id, "title": "Cached"}
+
+        # Written without signals, the cached objects are served
+        await sync_to_async(Event.objects.filter(id=event.id).update)(title="Stale")
+        response = await client.get(f"/{event.id}")
+        assert response.json()["data"]["title"] == "Cached"
+        assert "start_date" in response.json()["data"]
+        response = await client.get(f"/{event.id}", query=dict(fields="id,title"))
+        assert response.json()["data"] == {"id": event.id, "title": "Cached"}
+        response = await client.get(f"/{event.id}", query=dict(fields="title"))
+        assert response.json()["data"]["title"] == "Stale"
+
+        # Misses are not cached
+        response = await client.get("/0")
+        assert response.json()["code"] == 404
+
+    async def test_invalidate_on_write(self, transactional_db, easy_api_client):
+        client = easy_api_client(CachedAPIController)
+        event = await sync_to_async(Event.objects.create)(title="Cached")
+        owner = await sync_to_async(Client.objects.create)(name="Owner", key="o")
+
+        async def title():
+            response = await client.get(f"/{event.id}")
+            return response.json()["data"]["title"]
+
+        assert await title() == "Cached"
+
+        # PATCH, a single UPDATE without post_save
+        await client.patch(f"/{event.id}", json=dict(title="Patched"))
+        assert await title() == "Patched"
+
+        # PATCH /bulk
+        await client.patch("/bulk", json=[dict(id=event.id, title="Bulk")])
+        assert await title() == "Bulk"
+
+        # post_save
+        event.title = "Saved"
+        await sync_to_async(event.save)()
+        assert await title() == "Saved"
+
+        # m2m links written by the ORM, without m2m_changed listeners
+        await client.patch(f"/{event.id}", json=dict(lead_owner=[owner.id]))
+        response = await client.get(f"/{event.id}")
+        assert [o["name"] for o in response.json()["data"]["lead_owner"]] == ["Owner"]
+
+        # m2m_changed
+        await sync_to_async(event.owner.add)(owner)
+        response = await client.get(f"/{event.id}")
+        assert [o["name"] for o in response.json()["data"]["owner"]] == ["Owner"]
+        await sync_to_async(owner.events.clear)()
+        response = await client.get(f"/{event.id}")
+        assert response.json()["data"]["owner"] == []
+
+        # post_delete
+        event_id = event.id
+        await sync_to_async(event.delete)()
+        response = await client.get(f"/{event_id}")
+        assert response.json()["code"] == 404
+
+    async def test_service_get_obj(self, transactional_db, easy_api_client):
+        client = easy_api_client(CachedAPIController)
+        mine_client = easy_api_client(MineCachedAPIController)
+        mine = await sync_to_async(Event.objects.create)(title="mine")
+        other = await sync_to_async(Event.objects.create)(title="other")
+
+        # Same options, entries apart: read through the get_obj of each service
+        for _ in range(2):
+            response = await client.get(f"/{other.id}")
+            assert response.json()["data"]["title"] == "other"
+            response = await mine_client.get(f"/{other.id}")
+            assert response.json()["code"] == 404
+            response = await mine_client.get(f"/{mine.id}")
+            assert response.json()["data"]["title"] == "mine"
+
+    def test_invalidate_on_commit(self, transactional_db):
+        event = Event.objects.create(title="Cached")
+        key = get_object_version_key(Event, event.pk)
+        cache.set(key, 1)
+        with transaction.atomic():
+            event.save()
+            assert cache.get(key) == 1
+        assert cache.get(key) is None
+
+    async def test_fill_racing_write(self, transactional_db):
+        model_meta = CachedAPIController.model_meta
+        scope = CachedAPIController.cache_scope
+        event = await sync_to_async(Event.objects.create)(title="Cached")
+        encoded, version = await aget_cached_object(model_meta, scope, event.pk, None)
+        assert encoded is None
+
+        # Written (and invalidated) between the read of the miss and its store
+        await sync_to_async(invalidate_objects)(Event, [event.pk])
+        stale = EncodedJSON(b'{"title": "Stale"}')
+        await aset_cached_object(model_meta, scope, event.pk, None, stale, version)
+        encoded, version = await aget_cached_object(model_meta, scope, event.pk, None)
+        assert encoded is None
+
+        # Fieldsets are stored apart, under the version read
+        fresh = EncodedJSON(b'{"title": "Cached"}')
+        await aset_cached_object(model_meta, scope, event.pk, None, fresh, version)
+        await aset_cached_object(
+            model_meta, scope, event.pk, frozenset(["title"]), fresh, version
+        )
+        for fieldset in (None, frozenset(["title"])):
+            encoded, _ = await aget_cached_object(model_meta, scope, event.pk, fieldset)
+            assert encoded == fresh
+
+
+class TestListCache:
+    async def test_read_through(self, transactional_db, easy_api_client):
+        client = easy_api_client(CachedAPIController)
+        event = await sync_to_async(Event.objects.create)(title="Listed")
+
+        async def titles(**filters):
+            response = await client.get(
+                "/", query=dict(filters=json.dumps(filters), limit=10, fields="title")
+            )
+            return [item["title"] for item in response.json()["data"]]
+
+        assert await titles(title="Listed", id=event.id) == ["Listed"]
+
+        # Written without signals, the cached page is served, filters in any order
+        await sync_to_async(Event.objects.filter(id=event.id).update)(title="Stale")
+        assert await titles(id=event.id, title="Listed") == ["Listed"]
+        # Other filters, pages or fields are cached apart
+        assert await titles(id=event.id) == ["Stale"]
+        response = await client.get("/", query=dict(limit=10, offset=1))
+        assert response.json()["data"] == []
+        response = await client.get("/", query=dict(limit=10))
+        assert response.json()["data"][0]["title"] == "Stale"
+        assert response.json()["pagination"]["count"] == 1
+
+    async def test_service_get_objs(self, transactional_db, easy_api_client):
+        # Same options, the service of MineCachedAPIController lists mine only
+        client = easy_api_client(CachedAPIController)
+        mine_client = easy_api_client(MineCachedAPIController)
+        await sync_to_async(Event.objects.create)(title="mine")
+        await sync_to_async(Event.objects.create)(title="other")
+
+        async def titles(api_client):
+            response = await api_client.get("/", query=dict(limit=10))
+            return sorted(item["title"] for item in response.json()["data"])
+
+        for _ in range(2):
+            assert await titles(mine_client) == ["mine"]
+            assert await titles(client) == ["mine", "other"]
+
+    async def test_invalidate_on_write(self, transactional_db, easy_api_client):
+        client = easy_api_client(CachedAPIController)
+        event = await sync_to_async(Event.objects.create)(title="Listed")
+        owner = await sync_to_async(Client.objects.create)(name="Owner", key="o")
+
+        async def listed():
+            response = await client.get("/", query=dict(limit=10))
+            return response.json()["data"]
+
+        assert [item["title"] for item in await listed()] == ["Listed"]
+
+        # One write moves the model to a new generation, every page is stale
+        generation = await aget_generation(Event)
+        await client.patch(f"/{event.id}", json=dict(title="Patched"))
+        assert await aget_generation(Event) == generation + 1
+        assert [item["title"] for item in await listed()] == ["Patched"]
+
+        await client.put("/bulk", json=[dict(title="Added")])
+        assert len(await listed()) == 2
+
+        # m2m changes made from the related side
+        await sync_to_async(owner.events.add)(event)
+        (item,) = [item for item in await listed() if item["id"] == event.id]
+        assert [o["name"] for o in item["owner"]] == ["Owner"]
+
+        await client.delete("/bulk", query=dict(ids=str(event.id)))
+        assert [item["title"] for item in await listed()] == ["Added"]
+
+    async def test_fill_racing_write(self, transactional_db):
+        model_meta = CachedAPIController.model_meta
+        scope = CachedAPIController.cache_scope
+        queryset = Event.objects.all()
+        key = get_list_cache_key(
+            model_meta, scope, await aget_generation(Event), queryset, {}, {}
+        )
+
+        def get_page():
+            # Written (and invalidated) while the miss is being read
+            bump_generation(Event)
+            return {"items": []}
+
+        await aget_cached_page(model_meta, scope, queryset, {}, {}, get_page)
+        assert await cache.aget(key) is None
+
+    def test_generation(self, transactional_db):
+        key = get_generation_key(Event)
+        bump_generation(Event)
+        generation = cache.get(key)
+        bump_generation(Event)
+        assert cache.get(key) == generation + 1
+
+        # Restarted past the evicted generations
+        cache.delete(key)
+        bump_generation(Event)
+        assert cache.get(key) > generation + 1
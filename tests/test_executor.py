@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from easy.exception import APIServiceUnavailableException
+from easy.executor import DBExecutor, get_db_executor, set_db_executor
+
+from .easy_app.controllers import AutoGenCrudAPIController
+from .easy_app.models import Event
+
+
+@pytest.fixture
+def db_executor():
+    executor = DBExecutor(max_workers=1, max_queue=1)
+    set_db_executor(executor)
+    yield executor
+    set_db_executor(None)
+    executor.shutdown()
+
+
+async def block(executor, release):
+    started = threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    task = asyncio.ensure_future(executor.run(job))
+    await sync_to_async(started.wait, thread_sensitive=False)(5)
+    return task
+
+
+class TestDBExecutor:
+    async def test_run(self, db_executor):
+        assert await db_executor.run(sum, [1, 2]) == 3
+        stats = db_executor.stats()
+        assert stats["completed"] == 1
+        assert stats["active"] == stats["queued"] == stats["rejected"] == 0
+
+    async def test_saturated(self, db_executor):
+        release = threading.Event()
+        running = await block(db_executor, release)
+        queued = asyncio.ensure_future(db_executor.run(sum, [1]))
+        await asyncio.sleep(0)
+        assert db_executor.stats()["active"] == db_executor.stats()["queued"] == 1
+
+        with pytest.raises(APIServiceUnavailableException):
+            await db_executor.run(sum, [2])
+
+        release.set()
+        await running
+        assert await queued == 1
+        stats = db_executor.stats()
+        assert stats["completed"] == 2
+        assert stats["rejected"] == 1
+        assert stats["active"] == stats["queued"] == 0
+        assert stats["wait_time_max"] > 0
+
+    async def test_cancelled_while_queued(self, db_executor):
+        release = threading.Event()
+        running = await block(db_executor, release)
+        queued = asyncio.ensure_future(db_executor.run(sum, [1]))
+        await asyncio.sleep(0)
+        queued.cancel()
+        release.set()
+        await running
+        assert db_executor.stats()["queued"] == 0
+
+    def test_from_settings(self, settings):
+        # On by default
+        set_db_executor(None)
+        assert get_db_executor().max_workers == 10
+        set_db_executor(None)
+        settings.EASY_API_DB_MAX_WORKERS = 0
+        assert get_db_executor() is None
+        settings.EASY_API_DB_MAX_WORKERS = 2
+        settings.EASY_API_DB_MAX_QUEUE = 3
+        try:
+            executor = get_db_executor()
+            assert (executor.max_workers, executor.max_queue) == (2, 3)
+            assert get_db_executor() is executor
+        finally:
+            set_db_executor(None)
+
+    async def test_api(self, transactional_db, db_executor, easy_api_client):
+        client = easy_api_client(AutoGenCrudAPIController)
+        event = await sync_to_async(Event.objects.create)(title="Executor")
+
+        response = await client.get(f"/{event.id}")
+        assert response.json()["data"]["title"] == "Executor"
+        response = await client.get("/", query=dict(limit=2))
+        assert response.json()["data"][0]["title"] == "Executor"
+        assert db_executor.stats()["completed"] == 2
+
+        release = threading.Event()
+        running = await block(db_executor, release)
+        queued = asyncio.ensure_future(db_executor.run(sum, [1]))
+        await asyncio.sleep(0)
+        response = await client.get(f"/{event.id}")
+        release.set()
+        await running
+        await queued
+        assert response.status_code == 503
@@ -0,0 +1,160 @@
+import pytest
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.http import HttpRequest
+from ninja_extra.context import RouteContext
+
+from easy.controller.meta_conf import (
+    FIELD_KIND_MANY,
+    FIELD_KIND_ONE,
+    FIELD_KIND_VALUE,
+    ModelMetaRegistry,
+    ModelOptions,
+    get_request_model_meta,
+)
+from easy.domain.orm import django_serializer
+from easy.services import BaseService
+
+from .easy_app.controllers import (
+    AutoGenCrudAPIController,
+    AutoGenCrudNoJoinAPIController,
+    AutoGenCrudSomeFieldsAPIController,
+    InheritedRecursiveAPIController,
+    RecursiveAPIController,
+)
+from .easy_app.models import Client, Event
+
+
+class TestModelMetaRegistry:
+    def test_registered_once_per_options(self):
+        class APIMeta:
+            model = Event
+            model_join = True
+
+        model_meta = ModelMetaRegistry.register(
+            Event, ModelOptions.get_model_options(APIMeta)
+        )
+        assert model_meta is ModelMetaRegistry.register(
+            Event, ModelOptions.get_model_options(APIMeta)
+        )
+        assert model_meta is AutoGenCrudAPIController.model_meta
+        assert model_meta is not AutoGenCrudNoJoinAPIController.model_meta
+        assert (
+            RecursiveAPIController.model_meta
+            is InheritedRecursiveAPIController.model_meta
+        )
+
+    def test_field_tables(self):
+        model_meta = AutoGenCrudNoJoinAPIController.model_meta
+        assert [f.name for f in model_meta.m2m_fields] == ["owner", "lead_owner"]
+        assert [f.name for f in model_meta.fk_fields] == ["category", "type"]
+        assert {"password", "token", "sensitive_info"} <= model_meta.excluded_fields
+
+        client_meta = ModelMetaRegistry.get_model_meta(Client)
+        assert {f.name for f in client_meta.reverse_fields} == {
+            "events",
+            "lead_owner",
+        }
+
+    def test_unknown_count_strategy(self):
+        class APIMeta:
+            model = Event
+            count_strategy = "approximate"
+
+        with pytest.raises(ImproperlyConfigured):
+            ModelOptions.get_model_options(APIMeta)
+
+    def test_controller_meta_not_installed(self):
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        default_meta = ModelMetaRegistry.get_model_meta(Event)
+        join = AutoGenCrudAPIController(service=BaseService(model=Event))
+        no_join = AutoGenCrudNoJoinAPIController(service=None)
+        assert ModelMetaRegistry.get_model_meta(Event) is default_meta
+        assert join.service.model_meta is AutoGenCrudAPIController.model_meta
+        assert no_join.service.model_meta is AutoGenCrudNoJoinAPIController.model_meta
+
+        # Each request is serialized with the ModelMeta of its controller
+        request, other_request = HttpRequest(), HttpRequest()
+        join.context = RouteContext(request=request)
+        no_join.context = RouteContext(request=other_request)
+        assert get_request_model_meta(request) is join.model_meta
+        assert get_request_model_meta(other_request) is no_join.model_meta
+        event = Event(title="Event", sensitive_info="secret")
+        assert "sensitive_info" in django_serializer.serialize_data(
+            event, get_request_model_meta(request)
+        )
+        assert "sensitive_info" not in django_serializer.serialize_data(
+            event, get_request_model_meta(other_request)
+        )
+
+
+class TestSerializationPlan:
+    def test_plan_visible_fields(self):
+        model_meta = AutoGenCrudSomeFieldsAPIController.model_meta
+        assert [(f.name, f.kind) for f in model_meta.serialization_plan] == [
+            ("key", FIELD_KIND_VALUE),
+            ("name", FIELD_KIND_VALUE),
+        ]
+
+        plan = {
+            f.name: f.kind
+            for f in AutoGenCrudNoJoinAPIController.model_meta.serialization_plan
+        }
+        assert "sensitive_info" not in plan
+        assert plan["category"] == plan["type"] == FIELD_KIND_ONE
+        assert list(plan.values()).count(FIELD_KIND_MANY) == 1
+
+    def test_plan_follows_set_model_meta(self):
+        class APIMeta:
+            model_fields = ["title"]
+
+        ModelOptions.set_model_meta(Event, ModelOptions.get_model_options(APIMeta))
+        event = Event(title="plan")
+        assert django_serializer.serialize_model_instance(event) == {"title": "plan"}
+        assert django_serializer.show_field(event, "title")
+        assert not django_serializer.show_field(event, "end_date")
+
+        AutoGenCrudAPIController.model_meta.activate()
+        assert "end_date" in django_serializer.serialize_model_instance(event)
+
+    def test_select_related_plan(self):
+        model_meta = RecursiveAPIController.model_meta
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        flat_meta = ModelMetaRegistry.get_model_meta(Event)
+        # ForeignKey/OneToOne ids read from their column, nothing joined
+        assert flat_meta.get_select_related(3) == []
+        # reverse OneToOne of the (non recursive) related Category
+        assert model_meta.get_select_related(3) == [
+            "category",
+            "category__event",
+            "type",
+        ]
+        assert model_meta.get_select_related(1) == ["category", "type"]
+        assert model_meta.get_select_related(0) == []
+
+
+class TestWritePlan:
+    def test_split_payload(self):
+        model_meta = AutoGenCrudAPIController.model_meta
+        assert model_meta.write_plan["type"] == (FIELD_KIND_ONE, "type_id")
+        assert model_meta.write_plan["type_id"] == (FIELD_KIND_ONE, "type_id")
+        assert model_meta.write_plan["title"] == (FIELD_KIND_VALUE, "title")
+        assert model_meta.write_plan["owner"] == (FIELD_KIND_MANY, "owner")
+
+        local_fields, m2m_fields = model_meta.split_payload(
+            dict(title="Event", category=1, type_id=2, owner=[3])
+        )
+        assert local_fields == dict(title="Event", category_id=1, type_id=2)
+        assert m2m_fields == dict(owner=[3])
+
+        with pytest.raises(FieldDoesNotExist):
+            model_meta.split_payload(dict(events=[1]))
+
+    def test_schema_fields(self):
+        model_meta = AutoGenCrudSomeFieldsAPIController.model_meta
+        assert model_meta.schema_fields == ("key", "name")
+        assert set(model_meta.write_plan) == {"id", "key", "name"}
+
+        # Sensitive fields are kept out of reads only
+        model_meta = AutoGenCrudNoJoinAPIController.model_meta
+        assert {"sensitive_info", "lead_owner"} <= set(model_meta.schema_fields)
+        assert "id" not in model_meta.schema_fields
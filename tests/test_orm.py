@@ -0,0 +1,599 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet, signals
+from ninja.pagination import LimitOffsetPagination
+
+from easy.controller.meta_conf import ModelOptions
+from easy.domain.orm import DjangoOrmModel, django_serializer
+from easy.pagination import EasyCursorPagination, EasyLimitOffsetPagination
+from easy.renderer.json import EncodedJSON
+
+from .easy_app.models import Category, Client, Event, Tag, Type
+
+
+@pytest.fixture
+def events(db):
+    client_a = Client.objects.create(name="Client A", key="A")
+    events = []
+    for i in range(5):
+        event = Event.objects.create(title=f"Event {i}")
+        event.owner.set([client_a])
+        events.append(event)
+    return events
+
+
+class JoinAPIMeta:
+    model_join = True
+
+
+class ClientFieldsAPIMeta:
+    model_fields = ["key", "name"]
+
+
+class RecursiveAPIMeta:
+    model_join = True
+    model_recursive = True
+
+
+class NoM2MSignalsAPIMeta:
+    m2m_signals = False
+
+
+class TestReadQueryBudget:
+    def test_get_objs_is_lazy(self, events, django_assert_num_queries):
+        orm = DjangoOrmModel(Event)
+        with django_assert_num_queries(0):
+            qs = orm.crud_get_objs_all()
+            qs = orm.crud_get_objs_all(title__startswith="Event")
+            qs = orm.crud_get_objs_all(maximum=2)
+        assert qs._result_cache is None
+
+    def test_get_obj(self, events, django_assert_num_queries):
+        orm = DjangoOrmModel(Event)
+        # one query for the object, one per prefetched m2m field
+        with django_assert_num_queries(3):
+            obj = orm.crud_get_obj(events[0].pk)
+        assert obj == events[0]
+        with django_assert_num_queries(1):
+            assert orm.crud_get_obj(20000) is None
+
+    def test_paginated_page(self, events, django_assert_num_queries):
+        ModelOptions.set_model_meta(Event, ModelOptions(JoinAPIMeta))
+        orm = DjangoOrmModel(Event)
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=2, offset=2)
+        # count, page, one per prefetched m2m field
+        with django_assert_num_queries(4):
+            page = paginator.paginate_queryset(
+                orm.crud_get_objs_all(), pagination, request=None
+            )
+            data = django_serializer.serialize_data(page)
+        assert page["count"] == 5
+        assert [e["id"] for e in data] == [e.id for e in events[2:4]]
+        assert data[0]["owner"][0]["key"] == "A"
+
+    def test_recursive_page(self, events, django_assert_num_queries, settings):
+        event_type = Type.objects.create(name="Type")
+        for i, event in enumerate(events):
+            event.category = Category.objects.create(title=f"Category {i}")
+            event.type = event_type
+            event.save()
+        ModelOptions.set_model_meta(Event, ModelOptions(RecursiveAPIMeta))
+        orm = DjangoOrmModel(Event)
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=5, offset=0)
+        # one relationships are joined in, whatever the page size
+        with django_assert_num_queries(4):
+            page = paginator.paginate_queryset(
+                orm.crud_get_objs_all(), pagination, request=None
+            )
+            data = django_serializer.serialize_data(page)
+        assert [e["category"]["title"] for e in data] == [
+            f"Category {i}" for i in range(5)
+        ]
+        # the reverse OneToOne back to the referrer is joined too, not serialized
+        assert "event" not in data[0]["category"]
+        assert data[0]["type"]["name"] == "Type"
+
+        settings.EASY_API_SELECT_RELATED_DEPTH = 0
+        # one query per row and relationship (the reverse one is cached)
+        with django_assert_num_queries(4 + 5 * 2):
+            page = paginator.paginate_queryset(
+                orm.crud_get_objs_all(), pagination, request=None
+            )
+            django_serializer.serialize_data(page)
+
+    def test_foreign_key_ids(self, events, django_assert_num_queries):
+        type_a = Type.objects.create(name="Type")
+        Event.objects.update(type=type_a)
+        ModelOptions.set_model_meta(Event, ModelOptions(JoinAPIMeta))
+        qs = DjangoOrmModel(Event).crud_get_objs_all()
+        # not model_recursive, the ids are read from the FK columns, no join
+        assert not qs.query.select_related
+        with django_assert_num_queries(1 + 2):  # + the prefetched m2m fields
+            data = django_serializer.serialize_data(qs[:2])
+        assert [(e["type"], e["category"]) for e in data] == [(type_a.pk, None)] * 2
+
+    def test_reverse_relations(self, events, django_assert_num_queries):
+        category = Category.objects.create(title="Category")
+        Client.objects.filter(key="A").update(category=category)
+        Client.objects.create(name="Client B", key="B", category=category)
+
+        class ReverseAPIMeta:
+            model_reverse_relations = ["client_set"]
+
+        ModelOptions.set_model_meta(Category, ModelOptions(ReverseAPIMeta))
+        orm = DjangoOrmModel(Category)
+        # the object (reverse OneToOne joined in), one query for the reverse FK ids
+        with django_assert_num_queries(2):
+            data = django_serializer.serialize_data(orm.crud_get_obj(category.pk))
+        assert sorted(data["client_set"]) == sorted(
+            Client.objects.values_list("pk", flat=True)
+        )
+
+        class ReverseM2MAPIMeta:
+            model_join = True
+            model_reverse_relations = ["events"]
+
+        ModelOptions.set_model_meta(Client, ModelOptions(ReverseM2MAPIMeta))
+        orm = DjangoOrmModel(Client)
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=5, offset=0)
+        # count, page, one query per listed reverse relation
+        with django_assert_num_queries(3):
+            page = paginator.paginate_queryset(
+                orm.crud_get_objs_all(), pagination, request=None
+            )
+            data = django_serializer.serialize_data(page)
+        assert [e["id"] for e in data[0]["events"]] == [e.id for e in events]
+        assert data[1]["events"] == []
+
+    def test_fieldset(self, events, django_assert_num_queries):
+        ModelOptions.set_model_meta(Event, ModelOptions(JoinAPIMeta))
+        orm = DjangoOrmModel(Event)
+        fieldset = orm.model_meta.get_fieldset(["title", "owner"])
+        qs = orm.crud_get_objs_all(fieldset=fieldset)
+        assert qs.query.deferred_loading == ({"id", "title"}, False)
+        assert not qs.query.select_related
+        assert qs._prefetch_related_lookups == ("owner",)
+        # page and the one prefetched m2m field
+        with django_assert_num_queries(2):
+            data = django_serializer.serialize_data(qs[:2])
+        assert [set(e) for e in data] == [{"id", "title", "owner"}] * 2
+
+        # flat, served from a values() projection of the requested columns
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        fieldset = orm.model_meta.get_fieldset(exclude=["owner", "lead_owner"])
+        qs = orm.crud_get_objs_all(fieldset=fieldset)
+        assert django_serializer.is_values_serializable(qs)
+        data = django_serializer.serialize_data(qs)
+        assert set(data[0]) == fieldset | {"id"}
+        assert data == [
+            django_serializer.serialize_data(e)
+            for e in orm.crud_get_objs_all(fieldset=fieldset)
+        ]
+
+        with pytest.raises(ValueError):
+            orm.model_meta.get_fieldset(["unknown"])
+
+    def test_hidden_columns_deferred(self, events, django_assert_num_queries):
+        class SensitiveAPIMeta:
+            model_join = True
+            sensitive_fields = ["sensitive_info"]
+
+        ModelOptions.set_model_meta(Event, ModelOptions(SensitiveAPIMeta))
+        Event.objects.update(sensitive_info="secret")
+        orm = DjangoOrmModel(Event)
+        qs = orm.crud_get_objs_all()
+        assert qs.query.deferred_loading == ({"sensitive_info"}, True)
+        assert "sensitive_info" not in str(qs.query)
+        with django_assert_num_queries(3):
+            obj = orm.crud_get_obj(events[0].pk)
+            data = django_serializer.serialize_data(obj)
+        assert obj.get_deferred_fields() == {"sensitive_info"}
+        assert "sensitive_info" not in data and data["title"] == "Event 0"
+
+        orm = DjangoOrmModel(Client)
+        ModelOptions.set_model_meta(Client, ModelOptions(ClientFieldsAPIMeta))
+        assert orm.model_meta.deferred_fields == ("category", "password", "updated_at")
+        with django_assert_num_queries(1):
+            data = django_serializer.serialize_data(orm.crud_get_objs_all())
+        assert data == [{"key": "A", "name": "Client A"}]
+
+    def test_cursor_page(self, events, django_assert_num_queries):
+        ModelOptions.set_model_meta(Client, ModelOptions())
+        for i in range(10):
+            Client.objects.create(key=f"K{i}", name=f"Client {i % 3}")
+        orm = DjangoOrmModel(Client)
+        paginator = EasyCursorPagination()
+        queryset = orm.crud_get_objs_all().order_by("-name")
+        assert paginator.get_ordering(queryset) == ("-name", "pk")
+
+        names, cursor = [], None
+        for _ in range(4):
+            pagination = EasyCursorPagination.Input(page_size=3, cursor=cursor)
+            # page positions and the page itself, no count, whatever the page
+            with django_assert_num_queries(2):
+                page = paginator.paginate_queryset(queryset, pagination, request=None)
+                data = django_serializer.serialize_data(page)
+            names.extend(c["name"] for c in data)
+            cursor = django_serializer.get_pagination(page)["next"]
+        assert cursor is None
+        assert names == list(queryset.values_list("name", flat=True))
+
+    @pytest.mark.parametrize(
+        "count_strategy, count, has_more",
+        [("exact", 5, True), ("cached", 5, True), ("has_more", None, True)],
+    )
+    def test_count_strategy(
+        self, events, count_strategy, count, has_more, django_assert_num_queries
+    ):
+        class CountAPIMeta:
+            pass
+
+        CountAPIMeta.count_strategy = count_strategy
+        cache.clear()
+        ModelOptions.set_model_meta(Event, ModelOptions(CountAPIMeta))
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=2, offset=2)
+        qs = DjangoOrmModel(Event).crud_get_objs_all(title__startswith="Event")
+        with django_assert_num_queries(1):
+            page = paginator.paginate_queryset(qs, pagination, request=None)
+        assert page["count"] == count
+        assert django_serializer.get_pagination(page) == {
+            "count": count,
+            "has_more": has_more,
+            "count_strategy": count_strategy,
+        }
+        if count_strategy == "cached":
+            Event.objects.create(title="Event 5")
+            with django_assert_num_queries(0):
+                assert paginator.paginate_queryset(qs, pagination, None)["count"] == 5
+
+    def test_estimated_count(self, events):
+        class EstimatedAPIMeta:
+            count_strategy = "estimated"
+
+        ModelOptions.set_model_meta(Event, ModelOptions(EstimatedAPIMeta))
+        cache.clear()
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=10, offset=0)
+        # no planner estimate on SQLite, falls back to the cached count
+        assert paginator.get_estimated_count(Event.objects.all()) is None
+        page = paginator.paginate_queryset(Event.objects.all(), pagination, None)
+        assert django_serializer.get_pagination(page) == {
+            "count": 5,
+            "has_more": False,
+            "count_strategy": "cached",
+        }
+
+    @pytest.mark.parametrize("count_strategy", ["cached", "estimated"])
+    def test_empty_in_count(self, events, count_strategy, django_assert_num_queries):
+        class EmptyAPIMeta:
+            pass
+
+        EmptyAPIMeta.count_strategy = count_strategy
+        cache.clear()
+        ModelOptions.set_model_meta(Event, ModelOptions(EmptyAPIMeta))
+        paginator = EasyLimitOffsetPagination()
+        pagination = LimitOffsetPagination.Input(limit=10, offset=0)
+        qs = DjangoOrmModel(Event).crud_get_objs_all(pk__in=[])
+        with django_assert_num_queries(0):
+            page = paginator.paginate_queryset(qs, pagination, request=None)
+            assert django_serializer.serialize_data(page) == []
+        assert django_serializer.get_pagination(page) == {
+            "count": 0,
+            "has_more": False,
+            "count_strategy": "cached",
+        }
+
+
+class TestWriteQueryBudget:
+    def test_bulk_add_objs(self, db, django_assert_max_num_queries, settings):
+        settings.EASY_API_BULK_BATCH_SIZE = 50
+        client_a = Client.objects.create(key="A")
+        client_b = Client.objects.create(key="B")
+        payloads = [
+            dict(title=f"Bulk {i}", owner=[client_a.pk, client_b.pk, client_a.pk])
+            for i in range(100)
+        ]
+        payloads.append(dict(title="Bulk lead", lead_owner=[client_b.pk]))
+
+        # 3 batches of objects, 4 of (deduplicated) owner links, 1 of lead_owner
+        with django_assert_max_num_queries(8 + 2):  # + savepoint/release
+            pks = DjangoOrmModel(Event).crud_bulk_add_objs(payloads)
+
+        assert len(pks) == 101
+        events = Event.objects.filter(pk__in=pks).prefetch_related("owner")
+        assert [e.title for e in events.order_by("pk")][-1] == "Bulk lead"
+        assert {c.key for c in events.get(pk=pks[0]).owner.all()} == {"A", "B"}
+        assert list(Event.objects.get(pk=pks[-1]).lead_owner.all()) == [client_b]
+
+    def test_update_obj(self, events, django_assert_num_queries):
+        orm = DjangoOrmModel(Event)
+        pk = events[0].pk
+
+        # UPDATE ... WHERE pk= AND NOT (unchanged)
+        with django_assert_num_queries(1 + 2):  # + savepoint/release
+            assert orm.crud_update_obj(pk, {"title": "Patched"})
+        # No-op, nothing updated, then exists()
+        with django_assert_num_queries(2 + 2):
+            assert orm.crud_update_obj(pk, {"title": "Patched"})
+        with django_assert_num_queries(2 + 2):
+            assert not orm.crud_update_obj(20000, {"title": "Patched"})
+        event = Event.objects.get(pk=pk)
+        assert (event.title, event.start_date) == ("Patched", None)
+
+    def test_update_obj_auto_now(self, db, django_assert_num_queries):
+        client_a = Client.objects.create(key="A")
+        orm = DjangoOrmModel(Client)
+
+        # UPDATE ... WHERE pk=, auto_now written along, no-op PATCH included
+        with django_assert_num_queries(1 + 2):  # + savepoint/release
+            assert orm.crud_update_obj(client_a.pk, {"name": "A"})
+        updated_at = Client.objects.get(pk=client_a.pk).updated_at
+        assert updated_at > client_a.updated_at
+        with django_assert_num_queries(1 + 2):
+            assert orm.crud_update_obj(client_a.pk, {"name": "A"})
+        assert Client.objects.get(pk=client_a.pk).updated_at > updated_at
+        assert not orm.crud_update_obj(20000, {"name": "A"})
+
+        assert orm.crud_bulk_update_objs({client_a.pk: {"name": "Bulk"}})
+        client = Client.objects.get(pk=client_a.pk)
+        assert (client.name, client.updated_at > updated_at) == ("Bulk", True)
+
+    def test_update_obj_custom_pre_save(self, db, django_assert_num_queries):
+        type_a = Type.objects.create(name="Type A")
+        assert type_a.slug == "type-a"
+        orm = DjangoOrmModel(Type)
+
+        # select, UPDATE of the changed and pre_save columns
+        with django_assert_num_queries(2 + 2):  # + savepoint/release
+            assert orm.crud_update_obj(type_a.pk, {"name": "Type B"})
+        assert Type.objects.get(pk=type_a.pk).slug == "type-b"
+
+        # in_bulk, bulk_update
+        with django_assert_num_queries(2 + 2):
+            assert orm.crud_bulk_update_objs({type_a.pk: {"name": "Type C"}})
+        assert Type.objects.get(pk=type_a.pk).slug == "type-c"
+
+    def test_update_obj_custom_save(self, db, django_assert_num_queries):
+        tag = Tag.objects.create(name="Tag A")
+        assert tag.name == "tag a"
+        orm = DjangoOrmModel(Tag)
+
+        # select, UPDATE through save()
+        with django_assert_num_queries(2 + 2):  # + savepoint/release
+            assert orm.crud_update_obj(tag.pk, {"name": "Tag B"})
+        assert Tag.objects.get(pk=tag.pk).name == "tag b"
+        assert not orm.crud_update_obj(20000, {"name": "Tag B"})
+
+    def test_update_m2m_symmetrical(self, db):
+        tag_a, tag_b, tag_c = [Tag.objects.create(name=name) for name in "abc"]
+        orm = DjangoOrmModel(Tag)
+
+        def related(tag):
+            return sorted(t.name for t in tag.related.all())
+
+        assert orm.crud_update_obj(tag_a.pk, {"related": [tag_a.pk, tag_b.pk]})
+        assert (related(tag_a), related(tag_b)) == (["a", "b"], ["a"])
+
+        # Links are removed both ways
+        assert orm.crud_update_obj(tag_a.pk, {"related": [tag_c.pk]})
+        assert (related(tag_a), related(tag_b), related(tag_c)) == (["c"], [], ["a"])
+        assert orm.crud_bulk_update_objs({tag_c.pk: {"related": []}})
+        assert (related(tag_a), related(tag_c)) == ([], [])
+        assert not Tag.related.through.objects.exists()
+
+    def test_update_obj_save_receivers(self, events, django_assert_num_queries):
+        saved = []
+
+        def receiver(sender, instance, update_fields, **kwargs):
+            saved.append(update_fields)
+
+        signals.post_save.connect(receiver, sender=Event)
+        try:
+            orm = DjangoOrmModel(Event)
+            # select, UPDATE of the changed columns only
+            with django_assert_num_queries(2 + 2):  # + savepoint/release
+                assert orm.crud_update_obj(
+                    events[0].pk, {"title": "Patched", "start_date": None}
+                )
+            with django_assert_num_queries(1 + 2):
+                assert orm.crud_update_obj(events[0].pk, {"title": "Patched"})
+            assert not orm.crud_update_obj(20000, {"title": "Patched"})
+        finally:
+            signals.post_save.disconnect(receiver, sender=Event)
+        assert saved == [frozenset(["title"])]
+
+    def test_update_m2m(self, events, django_assert_num_queries):
+        client_a = Client.objects.get(key="A")
+        client_b = Client.objects.create(key="B")
+        changes = []
+
+        def receiver(sender, instance, action, pk_set, **kwargs):
+            changes.append((instance.pk, action, pk_set))
+
+        signals.m2m_changed.connect(receiver, sender=Event.owner.through)
+        try:
+            orm = DjangoOrmModel(Event)
+            payload = {"owner": [client_b.pk], "lead_owner": [client_a.pk]}
+            # exists(), objects for the signals, owner: select, delete, insert,
+            # lead_owner: select, insert, + savepoint/release
+            with django_assert_num_queries(1 + 1 + 3 + 2 + 2):
+                assert orm.crud_update_obj(events[0].pk, payload)
+            ModelOptions.set_model_meta(Event, ModelOptions(NoM2MSignalsAPIMeta))
+            with django_assert_num_queries(1 + 2 + 2):
+                assert orm.crud_update_obj(events[0].pk, {"owner": []})
+        finally:
+            signals.m2m_changed.disconnect(receiver, sender=Event.owner.through)
+            ModelOptions.set_model_meta(Event, ModelOptions())
+        assert changes == [
+            (events[0].pk, "pre_remove", {client_a.pk}),
+            (events[0].pk, "post_remove", {client_a.pk}),
+            (events[0].pk, "pre_add", {client_b.pk}),
+            (events[0].pk, "post_add", {client_b.pk}),
+        ]
+        event = Event.objects.get(pk=events[0].pk)
+        assert list(event.owner.all()) == []
+        assert list(event.lead_owner.all()) == [client_a]
+
+    def test_bulk_update_objs(self, events, django_assert_max_num_queries):
+        client_b = Client.objects.create(key="B")
+        client_a = Client.objects.get(key="A")
+        payloads = {e.pk: dict(title=f"Patched {e.pk}") for e in events[:3]}
+        payloads[events[0].pk].update(owner=[client_b.pk])
+        payloads[events[3].pk] = dict(start_date="2030-01-01", owner=[])
+        payloads[events[4].pk] = dict(owner=[client_a.pk, client_b.pk])
+        payloads[20000] = dict(title="Missing")
+
+        # pks, 2 column groups, owner links: select, delete, insert
+        with django_assert_max_num_queries(6 + 2):  # + savepoint/release
+            pks = DjangoOrmModel(Event).crud_bulk_update_objs(payloads)
+
+        assert sorted(pks) == [e.pk for e in events]
+        assert Event.objects.get(pk=events[1].pk).title == f"Patched {events[1].pk}"
+        assert str(Event.objects.get(pk=events[3].pk).start_date) == "2030-01-01"
+        assert Event.objects.get(pk=events[3].pk).title == "Event 3"
+        owners = {
+            e.pk: sorted(c.key for c in e.owner.all())
+            for e in Event.objects.prefetch_related("owner")
+        }
+        assert owners == {
+            events[0].pk: ["B"],
+            events[1].pk: ["A"],
+            events[2].pk: ["A"],
+            events[3].pk: [],
+            events[4].pk: ["A", "B"],
+        }
+
+    def test_bulk_del_objs(self, events, django_assert_max_num_queries, settings):
+        orm = DjangoOrmModel(Event)
+        pks = [e.pk for e in events[:3]]
+
+        with django_assert_max_num_queries(1 + 2):  # + savepoint/release
+            assert orm.crud_bulk_del_objs(dry_run=True, pk__in=pks) == (3, {})
+        settings.EASY_API_BULK_DELETE_MAXIMUM = 2
+        with pytest.raises(ValueError):
+            orm.crud_bulk_del_objs(pk__in=pks)
+        assert Event.objects.count() == 5
+
+        settings.EASY_API_BULK_DELETE_MAXIMUM = 3
+        count, deleted = orm.crud_bulk_del_objs(pk__in=pks)
+        assert count == 3
+        assert deleted == {"easy_app.Event": 3, "easy_app.Event_owner": 3}
+        assert Event.objects.count() == 2
+
+    @pytest.mark.parametrize("native", [True, False])
+    def test_bulk_upsert_objs(self, db, native, monkeypatch):
+        monkeypatch.setattr(
+            connection.features, "supports_update_conflicts_with_target", native
+        )
+        orm = DjangoOrmModel(Client)
+        client_a = Client.objects.create(key="A", name="Old A", password="secret")
+        payloads = [
+            dict(key="A", name="New A"),
+            dict(key="B", name="New B"),
+        ]
+        pks = orm.crud_bulk_upsert_objs(payloads, ["key"])
+
+        assert pks[0] == client_a.pk
+        assert Client.objects.get(pk=client_a.pk).updated_at > client_a.updated_at
+        clients = {c.key: c for c in Client.objects.all()}
+        assert (clients["A"].name, clients["A"].password) == ("New A", "secret")
+        assert (clients["B"].pk, clients["B"].name) == (pks[1], "New B")
+
+        # Only the fields of each payload are written
+        payloads = [dict(key="A", password="new"), dict(key="B", name="Newer B")]
+        assert orm.crud_bulk_upsert_objs(payloads, ["key"]) == pks
+        clients = {c.key: c for c in Client.objects.all()}
+        assert (clients["A"].name, clients["A"].password) == ("New A", "new")
+        assert (clients["B"].name, clients["B"].password) == ("Newer B", None)
+
+        with pytest.raises(ValueError):
+            orm.crud_bulk_upsert_objs(payloads, ["name"])
+        with pytest.raises(ValueError):
+            orm.crud_bulk_upsert_objs(payloads, ["unknown"])
+
+    def test_bulk_upsert_m2m(self, events, django_assert_max_num_queries):
+        client_b = Client.objects.create(key="B")
+        payloads = [
+            dict(id=events[0].pk, title="Upserted", owner=[client_b.pk]),
+            dict(id=20000, title="Created", owner=[client_b.pk]),
+        ]
+        # upsert, owner links: select, delete, insert
+        with django_assert_max_num_queries(4 + 2):  # + savepoint/release
+            pks = DjangoOrmModel(Event).crud_bulk_upsert_objs(payloads, ["id"])
+
+        assert pks == [events[0].pk, 20000]
+        owners = {
+            e.title: [c.key for c in e.owner.all()]
+            for e in Event.objects.filter(pk__in=pks).prefetch_related("owner")
+        }
+        assert owners == {"Upserted": ["B"], "Created": ["B"]}
+
+    @pytest.mark.parametrize("returned", [True, False])
+    def test_bulk_upsert_pks(self, db, returned, monkeypatch):
+        if not returned:
+            # As before Django 5.0, no pks from bulk_create(update_conflicts=True)
+            bulk_create = QuerySet.bulk_create
+
+            def bulk_create_no_pks(queryset, objs, *args, **kwargs):
+                objs = bulk_create(queryset, objs, *args, **kwargs)
+                if kwargs.get("update_conflicts"):
+                    for obj in objs:
+                        obj.pk = None
+                return objs
+
+            monkeypatch.setattr(QuerySet, "bulk_create", bulk_create_no_pks)
+        tag = Tag.objects.create(name="a", note="old")
+        client_a = Client.objects.create(key="A")
+        payloads = [
+            dict(name="a", note="new", clients=[client_a.pk]),
+            dict(name="b", note="new", clients=[client_a.pk]),
+        ]
+        pks = DjangoOrmModel(Tag).crud_bulk_upsert_objs(payloads, ["name"])
+
+        assert pks == [tag.pk, Tag.objects.get(name="b").pk]
+        assert Tag.objects.get(pk=tag.pk).note == "new"
+        links = Tag.clients.through.objects.values_list("tag_id", "client_id")
+        assert sorted(links) == [(pks[0], client_a.pk), (pks[1], client_a.pk)]
+
+
+class TestAsyncCrud:
+    async def test_page_encoded_in_worker(self, transactional_db, settings):
+        settings.EASY_API_SERIALIZE_IN_WORKER = True
+        await Event.objects.acreate(title="Event")
+        qs = await DjangoOrmModel(Event).acrud_get_objs_all()
+        page = await EasyLimitOffsetPagination().apaginate_queryset(
+            qs, LimitOffsetPagination.Input(limit=2, offset=0), request=None
+        )
+        assert isinstance(page["items"], EncodedJSON)
+        assert json.loads(page["items"])[0]["title"] == "Event"
+        assert django_serializer.serialize_data(page) is page["items"]
+
+    async def test_async_crud(self, transactional_db):
+        orm = DjangoOrmModel(Event)
+        client_a = await Client.objects.acreate(key="A")
+
+        pk = await orm.acrud_add_obj(title="Async")
+        assert (await orm.acrud_get_obj(pk)).title == "Async"
+        pk = await orm.acrud_add_obj(title="Async m2m", owner=[client_a.pk])
+        obj = await orm.acrud_get_obj(pk)
+        assert [c.pk for c in obj.owner.all()] == [client_a.pk]
+
+        qs = await orm.acrud_get_objs_all(title__startswith="Async")
+        assert qs._result_cache is None
+        assert await qs.acount() == 2
+
+        assert await orm.acrud_update_obj(pk, {"title": "Async patch"})
+        assert await orm.acrud_update_obj(pk, {"owner": []})
+        assert not await orm.acrud_update_obj(20000, {"title": "Async patch"})
+        assert (await orm.acrud_get_obj(pk)).title == "Async patch"
+
+        assert await orm.acrud_del_obj(pk)
+        assert not await orm.acrud_del_obj(pk)
+        assert await orm.acrud_get_obj(pk) is None
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from easy.controller.meta_conf import ModelOptions
+from easy.domain.orm import DjangoOrmModel, django_serializer
+from easy.renderer.json import EasyJSONEncoder
+
+from .easy_app.models import Category, Client, Event, Type
+
+
+@pytest.fixture
+def events(db):
+    type = Type.objects.create(name="Type")
+    client_a = Client.objects.create(name="Client A", key="A")
+    client_b = Client.objects.create(name="Client B", key="B")
+    events = []
+    for i in range(3):
+        event = Event.objects.create(
+            title=f"Event {i}",
+            type=type if i else None,
+            category=Category.objects.create(title=f"Category {i}"),
+            photo="client/photo/event.png" if i else None,
+        )
+        event.owner.set([client_b, client_a][i:])
+        event.lead_owner.set([client_a])
+        events.append(event)
+    return events
+
+
+def to_json(data):
+    return json.loads(json.dumps(data, cls=EasyJSONEncoder))
+
+
+class TestValuesSerialization:
+    def test_flat_queryset_uses_values(self, events, django_assert_num_queries):
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        qs = DjangoOrmModel(Event).crud_get_objs_all()
+        assert django_serializer.is_values_serializable(qs)
+
+        expected = to_json([django_serializer.serialize_model_instance(e) for e in qs])
+        # values() + one query per m2m through table
+        with django_assert_num_queries(3):
+            data = django_serializer.serialize_queryset(qs.all())
+        assert to_json(data) == expected
+        assert data[0]["type"] is None
+        assert data[1]["type"] == events[1].type_id
+        assert data[0]["owner"] == [o.pk for o in events[0].owner.all()]
+        assert data[2]["owner"] == []
+
+    def test_sliced_queryset_uses_values(self, events, django_assert_num_queries):
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        qs = DjangoOrmModel(Event).crud_get_objs_all()[1:2]
+        with django_assert_num_queries(3):
+            data = django_serializer.serialize_data(qs)
+        assert [e["id"] for e in data] == [events[1].id]
+
+    def test_not_flat_queryset(self, events):
+        class APIMeta:
+            model_join = True
+
+        ModelOptions.set_model_meta(Event, ModelOptions(APIMeta))
+        qs = DjangoOrmModel(Event).crud_get_objs_all()
+        assert not django_serializer.is_values_serializable(qs)
+        owner = django_serializer.serialize_queryset(qs)[0]["owner"]
+        assert {o["key"] for o in owner} == {"A", "B"}
+
+        ModelOptions.set_model_meta(Event, ModelOptions())
+        qs = Event.objects.all()
+        list(qs)
+        assert not django_serializer.is_values_serializable(qs)
+        assert not django_serializer.is_values_serializable(
+            Event.objects.prefetch_related("type")
+        )